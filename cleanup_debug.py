@@ -2,7 +2,6 @@
 """Clean up debug files."""
 
 import os
-import glob
 
 # Files to remove
 debug_files = [
@@ -11,8 +10,10 @@ debug_files = [
 ]
 
 for file in debug_files:
-    if os.path.exists(file):
+    try:
         os.remove(file)
-        print(f"Removed: {file}")
+    except FileNotFoundError:
+        continue
+    print(f"Removed: {file}")
 
 print("Cleanup complete.")
\ No newline at end of file
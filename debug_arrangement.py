@@ -1,33 +1,44 @@
 #!/usr/bin/env python3
 """Debug script to find PlayerArrangement attribute issue."""
 
-import sys
+import importlib
+import importlib.util
 import os
+import sys
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Candidate modules that may define PlayerArrangement, in priority order
+CANDIDATES = ("ofcpoker", "game_logic", "src.game.models", "src.core.arrangement")
+
+
+def _find_spec(name):
+    """Return the module spec for name, or None if it (or a parent) is missing."""
+    try:
+        return importlib.util.find_spec(name)
+    except ModuleNotFoundError:
+        return None
+
+
 # Try to import and inspect PlayerArrangement
 try:
-    # Try different possible import paths
-    try:
-        from ofcpoker import PlayerArrangement
-        print("✓ Imported PlayerArrangement from ofcpoker")
-    except ImportError:
+    # Probe each candidate and only import the one that resolves
+    PlayerArrangement = None
+    for name in CANDIDATES:
+        if _find_spec(name) is None:
+            continue
         try:
-            from game_logic import PlayerArrangement
-            print("✓ Imported PlayerArrangement from game_logic")
-        except ImportError:
-            try:
-                from src.game.models import PlayerArrangement
-                print("✓ Imported PlayerArrangement from src.game.models")
-            except ImportError:
-                try:
-                    from src.core.arrangement import PlayerArrangement
-                    print("✓ Imported PlayerArrangement from src.core.arrangement")
-                except ImportError:
-                    print("✗ Could not find PlayerArrangement in any expected location")
-                    sys.exit(1)
+            PlayerArrangement = importlib.import_module(name).PlayerArrangement
+        except (ImportError, AttributeError):
+            # Module exists but fails to import or lacks the class; try the next one
+            continue
+        print(f"✓ Imported PlayerArrangement from {name}")
+        break
+    
+    if PlayerArrangement is None:
+        print("✗ Could not find PlayerArrangement in any expected location")
+        sys.exit(1)
     
     # Create an instance and inspect its attributes
     print("\nPlayerArrangement attributes:")
@@ -26,55 +26,54 @@ def debug_apply_suggestion():
     print(f"街道牌: {[str(c) for c in street_cards]}")
     print(f"AI 建議: {suggestion}")
     
+    # 字串到牌的索引，只建立一次
+    by_str = {str(c): c for c in street_cards}
+    
     # 舊的實現（有問題）
     print("\n=== 舊實現（有問題）===")
-    placed_cards_old = []
+    placed_cards_old = {}
     for card_str, position in suggestion['placements']:
-        for card in street_cards:
-            if str(card) == card_str and card not in placed_cards_old:
-                print(f"  放置 {card} 到 {position}")
-                placed_cards_old.append(card)
-                break
+        card = by_str.get(card_str)
+        if card is not None and card not in placed_cards_old:
+            print(f"  放置 {card} 到 {position}")
+            placed_cards_old[card] = position
     
     # 找棄牌
-    for card in street_cards:
-        if str(card) == suggestion['discard']:
-            print(f"  棄牌: {card}")
-            break
+    card = by_str.get(suggestion['discard'])
+    if card is not None:
+        print(f"  棄牌: {card}")
     
     print(f"已放置的牌: {[str(c) for c in placed_cards_old]}")
     
     # 新的實現（修復版）
     print("\n=== 新實現（修復版）===")
-    placed_cards_new = []
-    discard_card = None
+    placed_cards_new = {}
     
     # 先找到棄牌
-    for card in street_cards:
-        if str(card) == suggestion['discard']:
-            discard_card = card
-            print(f"  找到棄牌: {discard_card}")
-            break
+    discard_card = by_str.get(suggestion['discard'])
+    if discard_card is not None:
+        print(f"  找到棄牌: {discard_card}")
     
     # 然後放置其他牌
     for card_str, position in suggestion['placements']:
-        for card in street_cards:
-            if str(card) == card_str and card not in placed_cards_new and card != discard_card:
-                print(f"  放置 {card} 到 {position}")
-                placed_cards_new.append(card)
-                break
+        card = by_str.get(card_str)
+        if card is not None and card not in placed_cards_new and card is not discard_card:
+            print(f"  放置 {card} 到 {position}")
+            placed_cards_new[card] = position
     
     print(f"已放置的牌: {[str(c) for c in placed_cards_new]}")
     print(f"棄牌: {discard_card}")
     
-    # 檢查結果
-    all_processed = placed_cards_new + ([discard_card] if discard_card else [])
-    unique_cards = set(str(c) for c in all_processed)
+    # 檢查結果：placed_cards_new 的鍵本身已唯一，只需確認棄牌不在其中
+    has_discard = discard_card is not None
+    discard_is_new = has_discard and discard_card not in placed_cards_new
+    unique_count = len(placed_cards_new) + discard_is_new
     
-    print(f"\n所有處理的牌: {[str(c) for c in all_processed]}")
-    print(f"唯一牌數量: {len(unique_cards)}")
+    processed = [str(c) for c in placed_cards_new] + ([str(discard_card)] if has_discard else [])
+    print(f"\n所有處理的牌: {processed}")
+    print(f"唯一牌數量: {unique_count}")
     
-    if len(all_processed) == 3 and len(unique_cards) == 3:
+    if discard_is_new and unique_count == 3:
         print("✓ 新實現正確，沒有重複！")
     else:
         print("✗ 仍有問題")
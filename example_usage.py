@@ -5,6 +5,7 @@ Example usage of OFC Solver.
 This script demonstrates how to use the solver in different scenarios.
 """
 
+import functools
 import sys
 sys.path.append('.')
 
@@ -12,12 +13,18 @@ from src.core.domain import GameState, Card, Street
 from src.ofc_solver import create_solver
 
 
+@functools.lru_cache(maxsize=8)
+def _solver(time_limit: float, num_threads: int):
+    """Return a shared solver per configuration so examples reuse its setup."""
+    return create_solver(time_limit=time_limit, num_threads=num_threads)
+
+
 def example_solve_initial_hand():
     """Example: Solve initial 5-card placement."""
     print("=== Example 1: Initial Hand Placement ===\n")
     
     # Create solver
-    solver = create_solver(time_limit=30.0, num_threads=4)
+    solver = _solver(time_limit=30.0, num_threads=4)
     
     # Create game and deal initial cards
     game = GameState(num_players=2, player_index=0, seed=42)
@@ -61,15 +68,7 @@ def example_solve_difficult_position():
     for card, pos, idx in placements:
         game.player_arrangement.place_card(card, pos, idx)
     
-    # Update game state
-    game._player_arrangement._used_cards.add(Card.from_string("Qh"))
-    game._player_arrangement._used_cards.add(Card.from_string("Qd"))
-    game._player_arrangement._used_cards.add(Card.from_string("7c"))
-    game._player_arrangement._used_cards.add(Card.from_string("8s"))
-    game._player_arrangement._used_cards.add(Card.from_string("9h"))
-    game._player_arrangement._used_cards.add(Card.from_string("2d"))
-    game._player_arrangement._used_cards.add(Card.from_string("3c"))
-    game._player_arrangement._used_cards.add(Card.from_string("4s"))
+    # place_card records each card as used, so only the street needs updating
     game._current_street = Street.SECOND
     
     print("Current position:")
@@ -86,7 +85,7 @@ def example_solve_difficult_position():
     print(f"\nNext cards: {' '.join(str(c) for c in game._current_hand)}")
     
     # Create solver and analyze
-    solver = create_solver(time_limit=30.0, num_threads=4)
+    solver = _solver(time_limit=30.0, num_threads=4)
     
     # First analyze the position
     analysis = solver.analyze_position(game)
@@ -108,7 +107,7 @@ def example_complete_game():
     """Example: Play a complete game with solver."""
     print("\n\n=== Example 3: Complete Game ===\n")
     
-    solver = create_solver(time_limit=20.0, num_threads=4)
+    solver = _solver(time_limit=20.0, num_threads=4)
     
     def progress_callback(status):
         print(f"  {status}")
@@ -170,7 +169,7 @@ def example_custom_analysis():
     print("\nThis is a strong starting hand with two pairs (AA and KK).")
     print("Let's see how the solver handles it...\n")
     
-    solver = create_solver(time_limit=60.0, num_threads=4)
+    solver = _solver(time_limit=60.0, num_threads=4)
     
     # Progress callback for detailed info
     def detailed_progress(sims, elapsed, status):
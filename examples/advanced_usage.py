@@ -11,7 +11,7 @@ from ofc_solver_fixed import OFCMCTSSolver, Card
 
 def analyze_hand(cards_str):
     """分析一手牌的最佳擺放"""
-    # 將字串轉換為牌
+    # 將字串轉換為牌（只解析一次，solve_initial_five 不會修改此列表）
     cards = [Card.from_string(c) for c in cards_str]
     
     print(f"\n分析手牌: {' '.join(cards_str)}")
@@ -24,9 +24,9 @@ def analyze_hand(cards_str):
         print(f"\n使用 {num_sims} 次模擬:")
         arrangement = solver.solve_initial_five(cards)
         
-        print(f"  前墩: {' '.join(str(c) for c in arrangement.front_hand.cards)}")
-        print(f"  中墩: {' '.join(str(c) for c in arrangement.middle_hand.cards)}")
-        print(f"  後墩: {' '.join(str(c) for c in arrangement.back_hand.cards)}")
+        print(f"  前墩: {' '.join(map(str, arrangement.front_hand.cards))}")
+        print(f"  中墩: {' '.join(map(str, arrangement.middle_hand.cards))}")
+        print(f"  後墩: {' '.join(map(str, arrangement.back_hand.cards))}")
 
 
 def main():
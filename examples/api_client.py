@@ -6,6 +6,8 @@ using Python requests library.
 """
 
 import json
+import os
+import sys
 import time
 from typing import Dict, Any, Optional, List
 from datetime import datetime
@@ -13,6 +15,10 @@ import requests
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_compat import dumps, loads
+
 
 class OFCSolverClient:
     """Client for OFC Solver API."""
@@ -36,9 +42,15 @@ class OFCSolverClient:
             total=3,
             backoff_factor=1,
             status_forcelist=[429, 500, 502, 503, 504],
-            method_whitelist=["HEAD", "GET", "OPTIONS", "POST"]
+            allowed_methods=["HEAD", "GET", "OPTIONS", "POST"]
+        )
+        # The client talks to a single host, so keep a small pool whose
+        # sockets are reused across polls instead of reconnecting
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=2,
+            pool_maxsize=8
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
@@ -46,7 +58,8 @@ class OFCSolverClient:
         self.session.headers.update({
             "X-API-Key": api_key,
             "Content-Type": "application/json",
-            "Accept": "application/json"
+            "Accept": "application/json",
+            "Connection": "keep-alive"
         })
     
     def _make_request(
@@ -58,12 +71,14 @@ class OFCSolverClient:
     ) -> Dict[str, Any]:
         """Make HTTP request to API."""
         url = f"{self.base_url}{endpoint}"
+        # Serialize once so a rate-limited retry reuses the same body
+        body = dumps(data) if data is not None else None
         
         try:
             response = self.session.request(
                 method=method,
                 url=url,
-                json=data,
+                data=body,
                 params=params,
                 timeout=self.timeout
             )
@@ -77,13 +92,13 @@ class OFCSolverClient:
                 response = self.session.request(
                     method=method,
                     url=url,
-                    json=data,
+                    data=body,
                     params=params,
                     timeout=self.timeout
                 )
             
             response.raise_for_status()
-            return response.json()
+            return loads(response.content)
             
         except requests.exceptions.RequestException as e:
             print(f"Request failed: {e}")
@@ -169,13 +184,14 @@ class OFCSolverClient:
         Returns:
             Batch job info
         """
-        batch_positions = []
-        for i, pos in enumerate(positions):
-            batch_positions.append({
+        batch_positions = [
+            {
                 "id": f"pos_{i}",
                 "game_state": pos["game_state"],
                 "options": pos.get("options", {})
-            })
+            }
+            for i, pos in enumerate(positions)
+        ]
         
         data = {
             "positions": batch_positions,
@@ -197,28 +213,49 @@ class OFCSolverClient:
         """Get async task status."""
         return self._make_request("GET", f"/api/v1/tasks/{task_id}")
     
-    def wait_for_task(self, task_id: str, poll_interval: int = 2) -> Dict[str, Any]:
+    def wait_for_task(
+        self,
+        task_id: str,
+        poll_interval: float = 2,
+        max_poll_interval: float = 30
+    ) -> Dict[str, Any]:
         """
         Wait for async task to complete.
         
+        The polling interval doubles after each pending poll, up to
+        max_poll_interval, so long solves need O(log n) status requests.
+        A "poll_after" hint in the status response takes precedence.
+        
         Args:
             task_id: Task ID to wait for
-            poll_interval: Polling interval in seconds
+            poll_interval: Initial polling interval in seconds
+            max_poll_interval: Upper bound for the polling interval in seconds
             
         Returns:
             Task result
         """
+        get_status = self.get_task_status
+        sleep = time.sleep
+        last_reported = None
+        interval = poll_interval
+        
         while True:
-            status = self.get_task_status(task_id)
+            status = get_status(task_id)
+            state = status.get("status")
             
-            if status["status"] == "completed":
+            if state == "completed":
                 return status["result"]
-            elif status["status"] == "failed":
+            elif state == "failed":
                 raise Exception(f"Task failed: {status.get('error', 'Unknown error')}")
             
-            print(f"Task {task_id} status: {status['status']}"
-                  f" (progress: {status.get('progress', 0)}%)")
-            time.sleep(poll_interval)
+            # Only report when the state or progress actually changed
+            progress = status.get("progress", 0)
+            if (state, progress) != last_reported:
+                last_reported = (state, progress)
+                print(f"Task {task_id} status: {state} (progress: {progress}%)")
+            
+            sleep(status.get("poll_after") or interval)
+            interval = min(interval * 2, max_poll_interval)
     
     def health_check(self) -> Dict[str, Any]:
         """Check API health."""
@@ -374,12 +411,19 @@ def main():
     
     # Check batch status
     print("\nChecking batch status...")
+    get_batch_status = client.get_batch_status
+    last_reported = None
     while True:
-        status = client.get_batch_status(job_id)
-        print(f"Status: {status['status']}")
-        print(f"Completed: {status['completed_positions']}/{status['total_positions']}")
+        status = get_batch_status(job_id)
+        state = status['status']
+        completed = status['completed_positions']
+        
+        if (state, completed) != last_reported:
+            last_reported = (state, completed)
+            print(f"Status: {state}")
+            print(f"Completed: {completed}/{status['total_positions']}")
         
-        if status['status'] == 'completed':
+        if state == 'completed':
             print("\nBatch results:")
             for result in status['results']:
                 print(f"- Position {result['position_id']}: {result['status']}")
@@ -7,14 +7,33 @@ Shows simplified input formats and common use cases.
 
 import httpx
 import asyncio
-import json
+import importlib.util
+import os
+import sys
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional; fall back to the default event loop
+    uvloop = None
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_compat import dumps, loads
 
 # API configuration
 API_URL = "http://localhost:8000"
 API_KEY = "test_key"  # Replace with your actual API key
 
+# HTTP/2 lets the submit and poll requests multiplex over one connection;
+# httpx only supports it with the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Every valid card notation, e.g. "As", and its pre-built (read-only) API card object
+_VALID_CARDS = frozenset(r + s for r in "23456789TJQKA" for s in "shdc")
+_CARD_DICTS = {n: {"rank": n[0], "suit": n[1]} for n in _VALID_CARDS}
+
 
-async def example_simple_solve():
+async def example_simple_solve(client: httpx.AsyncClient):
     """Example: Simple solve with minimal input."""
     print("=== Simple Solve Example ===\n")
     
@@ -46,27 +65,22 @@ async def example_simple_solve():
         }
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{API_URL}/api/v1/solve",
-            json=request,
-            headers={"X-API-Key": API_KEY}
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            print(f"Best move found in {result['computation_time']:.2f} seconds:")
-            for placement in result['best_move']['card_placements']:
-                card = placement['card']
-                hand = placement['hand']
-                print(f"  Place {card['rank']}{card['suit']} in {hand}")
-            print(f"\nExpected score: {result['evaluation']:.2f}")
-            print(f"Confidence: {result['confidence']:.2%}")
-        else:
-            print(f"Error: {response.text}")
+    response = await client.post("/api/v1/solve", content=dumps(request))
+    
+    if response.status_code == 200:
+        result = loads(response.content)
+        print(f"Best move found in {result['computation_time']:.2f} seconds:")
+        for placement in result['best_move']['card_placements']:
+            card = placement['card']
+            hand = placement['hand']
+            print(f"  Place {card['rank']}{card['suit']} in {hand}")
+        print(f"\nExpected score: {result['evaluation']:.2f}")
+        print(f"Confidence: {result['confidence']:.2%}")
+    else:
+        print(f"Error: {response.text}")
 
 
-async def example_mid_game_analysis():
+async def example_mid_game_analysis(client: httpx.AsyncClient):
     """Example: Analyze a mid-game position."""
     print("\n=== Mid-Game Analysis Example ===\n")
     
@@ -114,33 +128,28 @@ async def example_mid_game_analysis():
         }
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{API_URL}/api/v1/analyze",
-            json=request,
-            headers={"X-API-Key": API_KEY}
-        )
+    response = await client.post("/api/v1/analyze", content=dumps(request))
+    
+    if response.status_code == 200:
+        result = loads(response.content)
+        print("Position Analysis:")
+        print(f"  Overall evaluation: {result['evaluation']:.2f}")
+        print(f"  Fantasy land chance: {result['fantasy_land_probability']:.1%}")
+        print(f"  Foul risk: {result['foul_probability']:.1%}")
         
-        if response.status_code == 200:
-            result = response.json()
-            print("Position Analysis:")
-            print(f"  Overall evaluation: {result['evaluation']:.2f}")
-            print(f"  Fantasy land chance: {result['fantasy_land_probability']:.1%}")
-            print(f"  Foul risk: {result['foul_probability']:.1%}")
-            
-            print("\nHand strengths:")
-            for hand, strength in result['hand_strengths'].items():
-                print(f"  {hand}: {strength['current_rank']} "
-                      f"(strength: {strength['current_strength']:.2f})")
-            
-            print("\nRecommendations:")
-            for i, rec in enumerate(result['recommendations'][:3], 1):
-                print(f"  {i}. {rec['reasoning']}")
-        else:
-            print(f"Error: {response.text}")
+        print("\nHand strengths:")
+        for hand, strength in result['hand_strengths'].items():
+            print(f"  {hand}: {strength['current_rank']} "
+                  f"(strength: {strength['current_strength']:.2f})")
+        
+        print("\nRecommendations:")
+        for i, rec in enumerate(result['recommendations'][:3], 1):
+            print(f"  {i}. {rec['reasoning']}")
+    else:
+        print(f"Error: {response.text}")
 
 
-async def example_async_solve():
+async def example_async_solve(client: httpx.AsyncClient):
     """Example: Async solve for longer computations."""
     print("\n=== Async Solve Example ===\n")
     
@@ -189,52 +198,49 @@ async def example_async_solve():
         }
     }
     
-    async with httpx.AsyncClient() as client:
-        # Submit async task
-        response = await client.post(
-            f"{API_URL}/api/v1/solve",
-            json=request,
-            headers={"X-API-Key": API_KEY}
-        )
+    # Submit async task
+    response = await client.post("/api/v1/solve", content=dumps(request))
+    
+    if response.status_code == 200:
+        task_info = loads(response.content)
+        task_id = task_info['task_id']
+        print(f"Task submitted: {task_id}")
+        print("Processing... ", end="", flush=True)
         
-        if response.status_code == 200:
-            task_info = response.json()
-            task_id = task_info['task_id']
-            print(f"Task submitted: {task_id}")
-            print("Processing... ", end="", flush=True)
+        # Poll for result with exponential backoff (50ms doubling up to 1s)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + 10.0  # Try for up to 10 seconds
+        delay = 0.05
+        while loop.time() < deadline:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+            # No flush per dot; the final status line flushes the progress
+            print(".", end="", flush=False)
             
-            # Poll for result
-            for i in range(10):  # Try for up to 10 seconds
-                await asyncio.sleep(1)
-                print(".", end="", flush=True)
-                
-                status_response = await client.get(
-                    f"{API_URL}/api/v1/tasks/{task_id}",
-                    headers={"X-API-Key": API_KEY}
-                )
-                
-                if status_response.status_code == 200:
-                    status = status_response.json()
-                    if status['status'] == 'completed':
-                        print(" Done!")
-                        result = status['result']
-                        print(f"\nBest move:")
-                        for placement in result['best_move']['card_placements']:
-                            card = placement['card']
-                            hand = placement['hand']
-                            print(f"  Place {card['rank']}{card['suit']} in {hand}")
-                        break
-                    elif status['status'] == 'failed':
-                        print(" Failed!")
-                        print(f"Error: {status.get('error', 'Unknown error')}")
-                        break
-            else:
-                print(" Timeout!")
+            status_response = await client.get(f"/api/v1/tasks/{task_id}")
+            
+            if status_response.status_code == 200:
+                status = loads(status_response.content)
+                if status['status'] == 'completed':
+                    print(" Done!", flush=True)
+                    result = status['result']
+                    print(f"\nBest move:")
+                    for placement in result['best_move']['card_placements']:
+                        card = placement['card']
+                        hand = placement['hand']
+                        print(f"  Place {card['rank']}{card['suit']} in {hand}")
+                    break
+                elif status['status'] == 'failed':
+                    print(" Failed!", flush=True)
+                    print(f"Error: {status.get('error', 'Unknown error')}")
+                    break
         else:
-            print(f"Error: {response.text}")
+            print(" Timeout!", flush=True)
+    else:
+        print(f"Error: {response.text}")
 
 
-async def example_card_shortcuts():
+def example_card_shortcuts():
     """Example: Using card notation shortcuts."""
     print("\n=== Card Notation Examples ===\n")
     
@@ -250,9 +256,9 @@ async def example_card_shortcuts():
     # You can also create a helper function for easier card creation
     def card(notation):
         """Convert string notation to card object. E.g., 'As' -> {'rank': 'A', 'suit': 's'}"""
-        if len(notation) == 2:
-            return {"rank": notation[0], "suit": notation[1]}
-        raise ValueError(f"Invalid card notation: {notation}")
+        if notation not in _VALID_CARDS:
+            raise ValueError(f"Invalid card notation: {notation}")
+        return _CARD_DICTS[notation]  # shared object, treat as read-only
     
     # Example usage
     game_state = {
@@ -284,23 +290,38 @@ async def main():
     
     """)
     
-    # Check if API is available
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{API_URL}/api/v1/health")
+    # Pure documentation, no server needed, so show it before the health check
+    example_card_shortcuts()
+    
+    # One client for every example, so all requests share a keep-alive pool
+    async with httpx.AsyncClient(
+        base_url=API_URL,
+        headers={"X-API-Key": API_KEY, "Content-Type": "application/json"},
+        http2=HTTP2_AVAILABLE,
+        # Keep idle connections for 30s (default 5s) so the async-solve
+        # polling window never has its connection reaped mid-sequence
+        limits=httpx.Limits(
+            max_keepalive_connections=4,
+            max_connections=8,
+            keepalive_expiry=30.0
+        ),
+        timeout=httpx.Timeout(60.0, connect=5.0)
+    ) as client:
+        # Check if API is available
+        try:
+            response = await client.get("/api/v1/health")
             if response.status_code != 200:
                 print("❌ API server is not healthy")
                 return
-    except httpx.ConnectError:
-        print("❌ Cannot connect to API server at", API_URL)
-        print("Please start the server with: python run_api.py")
-        return
-    
-    # Run examples
-    await example_simple_solve()
-    await example_mid_game_analysis()
-    await example_async_solve()
-    await example_card_shortcuts()
+        except httpx.ConnectError:
+            print("❌ Cannot connect to API server at", API_URL)
+            print("Please start the server with: python run_api.py")
+            return
+        
+        # Run examples
+        await example_simple_solve(client)
+        await example_mid_game_analysis(client)
+        await example_async_solve(client)
     
     print("\n✅ All examples completed!")
     print("\nFor more details, see the API documentation at:")
@@ -308,4 +329,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        uvloop.install()
     asyncio.run(main())
\ No newline at end of file
@@ -22,7 +22,7 @@ def main():
         Card.from_string("Ts")   # 黑桃10
     ]
     
-    print("要擺放的牌:", " ".join(str(c) for c in cards))
+    print("要擺放的牌:", " ".join(map(str, cards)))
     print("\n開始求解...")
     
     # 求解最佳擺放位置
@@ -30,9 +30,9 @@ def main():
     
     # 顯示結果
     print("\n最佳擺放方案:")
-    print(f"前墩 (Front): {' '.join(str(c) for c in arrangement.front_hand.cards)}")
-    print(f"中墩 (Middle): {' '.join(str(c) for c in arrangement.middle_hand.cards)}")
-    print(f"後墩 (Back): {' '.join(str(c) for c in arrangement.back_hand.cards)}")
+    print(f"前墩 (Front): {' '.join(map(str, arrangement.front_hand.cards))}")
+    print(f"中墩 (Middle): {' '.join(map(str, arrangement.middle_hand.cards))}")
+    print(f"後墩 (Back): {' '.join(map(str, arrangement.back_hand.cards))}")
     
     # 檢查是否有效
     if arrangement.is_valid():
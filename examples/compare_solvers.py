@@ -3,8 +3,11 @@
 比較簡單版和完整版求解器
 """
 
+import io
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from ofc_solver_fixed import OFCMCTSSolver, Card
@@ -22,9 +25,9 @@ def compare_solvers(cards_str):
     simple_cards = [Card.from_string(c) for c in cards_str]
     simple_result = simple_solver.solve_initial_five(simple_cards)
     
-    print(f"前墩: {' '.join(str(c) for c in simple_result.front_hand.cards)}")
-    print(f"中墩: {' '.join(str(c) for c in simple_result.middle_hand.cards)}")
-    print(f"後墩: {' '.join(str(c) for c in simple_result.back_hand.cards)}")
+    print(f"前墩: {' '.join(map(str, simple_result.front_hand.cards))}")
+    print(f"中墩: {' '.join(map(str, simple_result.middle_hand.cards))}")
+    print(f"後墩: {' '.join(map(str, simple_result.back_hand.cards))}")
     
     # 完整版求解器（模擬整個遊戲）
     print("\n[完整版] 模擬完整 Pineapple OFC:")
@@ -32,9 +35,17 @@ def compare_solvers(cards_str):
     full_cards = [FullCard.from_string(c) for c in cards_str]
     full_result = full_solver.solve_initial_five(full_cards)
     
-    print(f"前墩: {' '.join(str(c) for c in full_result.front_hand.cards)}")
-    print(f"中墩: {' '.join(str(c) for c in full_result.middle_hand.cards)}")
-    print(f"後墩: {' '.join(str(c) for c in full_result.back_hand.cards)}")
+    print(f"前墩: {' '.join(map(str, full_result.front_hand.cards))}")
+    print(f"中墩: {' '.join(map(str, full_result.middle_hand.cards))}")
+    print(f"後墩: {' '.join(map(str, full_result.back_hand.cards))}")
+
+
+def _run_pair(cards_str):
+    """在子進程中比較一手牌，回傳完整輸出以便依序打印"""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        compare_solvers(cards_str)
+    return buffer.getvalue()
 
 
 def main():
@@ -45,8 +56,11 @@ def main():
         ["Ac", "Ad", "Ah", "Kc", "Qs"],  # 三條
     ]
     
-    for hand in test_hands:
-        compare_solvers(hand)
+    # 每手牌的 MCTS 求解互相獨立且受 CPU 限制，分散到多個進程並行
+    max_workers = min(len(test_hands), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for output in executor.map(_run_pair, test_hands):
+            print(output, end='')
 
 
 if __name__ == "__main__":
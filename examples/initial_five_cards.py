@@ -5,12 +5,64 @@ OFC Solver - 初始5張牌求解範例
 """
 
 import requests
-import json
-from typing import List, Dict
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+from requests.adapters import HTTPAdapter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_compat import dumps, loads
+
+# 設定 OFC_DEBUG=1 以打印原始 API 響應
+DEBUG = os.getenv("OFC_DEBUG") == "1"
+
+# 花色符號與墩位名稱對照表
+_SUIT_SYM = {'s': '♠', 'h': '♥', 'd': '♦', 'c': '♣'}
+_HAND_NAMES = {'top': '前墩', 'middle': '中墩', 'bottom': '後墩'}
+
+# 初始狀態的遊戲模板 - 所有墩位都是空的，每次請求只替換 drawn_cards
+# （模板只會被序列化，不會被修改）
+_GAME_STATE_TEMPLATE = {
+    "current_round": 1,
+    "players": [
+        {
+            "player_id": "player1",
+            "top_hand": {"cards": [], "max_size": 3},
+            "middle_hand": {"cards": [], "max_size": 5},
+            "bottom_hand": {"cards": [], "max_size": 5},
+            "in_fantasy_land": False,
+            "next_fantasy_land": False,
+            "is_folded": False
+        },
+        {
+            "player_id": "player2",
+            "top_hand": {"cards": [], "max_size": 3},
+            "middle_hand": {"cards": [], "max_size": 5},
+            "bottom_hand": {"cards": [], "max_size": 5},
+            "in_fantasy_land": False,
+            "next_fantasy_land": False,
+            "is_folded": False
+        }
+    ],
+    "current_player_index": 0,
+    "drawn_cards": [],
+    "remaining_deck": []  # 初始求解不需要剩餘牌庫
+}
+
+# 共用的 HTTP 連線，所有請求重用同一個連線池
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    "Content-Type": "application/json",
+    "X-API-Key": "test_key"
+})
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 
 def solve_initial_five_cards(cards: List[Dict[str, str]], 
                            time_limit: float = 10.0,
-                           threads: int = 4) -> Dict:
+                           threads: int = 4) -> Tuple[Optional[Dict], Optional[bytes]]:
     """
     求解初始5張牌的最佳擺放策略
     
@@ -20,43 +72,14 @@ def solve_initial_five_cards(cards: List[Dict[str, str]],
         threads: 使用的線程數
     
     Returns:
-        API 響應結果
+        (API 響應結果, 原始響應位元組)；原始位元組僅在 OFC_DEBUG=1 時保留
     """
     
     # API 端點
     api_url = "http://localhost:8000/api/v1/solve"
-    headers = {
-        "Content-Type": "application/json",
-        "X-API-Key": "test_key"
-    }
     
-    # 構建遊戲狀態 - 初始狀態所有墩位都是空的
-    game_state = {
-        "current_round": 1,
-        "players": [
-            {
-                "player_id": "player1",
-                "top_hand": {"cards": [], "max_size": 3},
-                "middle_hand": {"cards": [], "max_size": 5},
-                "bottom_hand": {"cards": [], "max_size": 5},
-                "in_fantasy_land": False,
-                "next_fantasy_land": False,
-                "is_folded": False
-            },
-            {
-                "player_id": "player2",
-                "top_hand": {"cards": [], "max_size": 3},
-                "middle_hand": {"cards": [], "max_size": 5},
-                "bottom_hand": {"cards": [], "max_size": 5},
-                "in_fantasy_land": False,
-                "next_fantasy_land": False,
-                "is_folded": False
-            }
-        ],
-        "current_player_index": 0,
-        "drawn_cards": cards,
-        "remaining_deck": []  # 初始求解不需要剩餘牌庫
-    }
+    # 構建遊戲狀態 - 只有 drawn_cards 會變，其餘沿用共用模板
+    game_state = {**_GAME_STATE_TEMPLATE, "drawn_cards": cards}
     
     # 求解選項
     options = {
@@ -71,118 +94,126 @@ def solve_initial_five_cards(cards: List[Dict[str, str]],
     }
     
     try:
-        response = requests.post(api_url, json=request_data, headers=headers)
+        response = _SESSION.post(api_url, data=dumps(request_data))
         response.raise_for_status()
-        return response.json()
+        # 調試時另外回傳原始位元組，直接寫出，不必再序列化一次
+        raw = response.content if DEBUG else None
+        return loads(response.content), raw
     except requests.exceptions.RequestException as e:
         print(f"API 請求失敗: {e}")
         if hasattr(e.response, 'text'):
             print(f"錯誤詳情: {e.response.text}")
-        return None
+        return None, None
 
 
-def print_result(result: Dict):
+def print_result(result: Optional[Dict], raw: Optional[bytes] = None):
     """打印求解結果"""
     if not result:
         return
     
-    # 調試: 打印原始響應
-    print("\n[DEBUG] 原始響應:")
-    print(json.dumps(result, indent=2))
+    # 調試: 打印原始響應（僅在 OFC_DEBUG=1 時）
+    if DEBUG:
+        sys.stdout.write("\n[DEBUG] 原始響應:\n")
+        if raw is not None:
+            sys.stdout.write(raw.decode())
+        else:
+            sys.stdout.write(dumps(result, indent=True).decode())
+        sys.stdout.write("\n")
     
-    print("\n🎯 最佳擺放策略:")
-    print("-" * 40)
+    # 先組好全部輸出，最後一次寫入 stdout
+    lines = ["\n🎯 最佳擺放策略:", "-" * 40]
     
     # 獲取最佳動作
     best_move = result.get('best_move') or result.get('move')
     if best_move and not best_move.get('is_fold', False):
         placements = best_move.get('card_placements', [])
         if not placements:
-            print("  [警告] 沒有找到卡牌擺放信息")
+            lines.append("  [警告] 沒有找到卡牌擺放信息")
         else:
             for placement in placements:
                 card = placement['card']
                 hand = placement['hand']
                 
                 # 將花色符號轉換為中文
-                suit_symbols = {'s': '♠', 'h': '♥', 'd': '♦', 'c': '♣'}
-                card_str = f"{card['rank']}{suit_symbols.get(card['suit'], card['suit'])}"
+                card_str = f"{card['rank']}{_SUIT_SYM.get(card['suit'], card['suit'])}"
                 
                 # 將位置轉換為中文
-                hand_names = {'top': '前墩', 'middle': '中墩', 'bottom': '後墩'}
-                hand_name = hand_names.get(hand, hand)
+                hand_name = _HAND_NAMES.get(hand, hand)
                 
-                print(f"  {card_str} → {hand_name}")
+                lines.append(f"  {card_str} → {hand_name}")
     else:
-        print("  建議棄牌")
+        lines.append("  建議棄牌")
     
-    print("\n📊 評估信息:")
-    print(f"  期望分數: {result.get('evaluation', 0):.2f}")
-    print(f"  置信度: {result.get('confidence', 0):.2%}")
-    print(f"  計算時間: {result.get('computation_time', 0):.2f}秒")
+    lines.append("\n📊 評估信息:")
+    lines.append(f"  期望分數: {result.get('evaluation', 0):.2f}")
+    lines.append(f"  置信度: {result.get('confidence', 0):.2%}")
+    lines.append(f"  計算時間: {result.get('computation_time', 0):.2f}秒")
     
     # 打印統計信息
     if 'statistics' in result:
         stats = result['statistics']
-        print(f"\n📈 統計信息:")
-        print(f"  總模擬次數: {stats.get('total_iterations', 0):,}")
-        print(f"  訪問節點數: {stats.get('nodes_visited', 0):,}")
+        lines.append(f"\n📈 統計信息:")
+        lines.append(f"  總模擬次數: {stats.get('total_iterations', 0):,}")
+        lines.append(f"  訪問節點數: {stats.get('nodes_visited', 0):,}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
     """主函數"""
     print("=== OFC Solver 初始5張牌求解範例 ===\n")
     
-    # 範例1: 一手好牌
-    print("範例1: 一手好牌（對子 + 同花）")
-    cards_1 = [
-        {"rank": "A", "suit": "s"},  # A♠
-        {"rank": "A", "suit": "h"},  # A♥ - 對子
-        {"rank": "K", "suit": "s"},  # K♠ - 同花
-        {"rank": "Q", "suit": "s"},  # Q♠ - 同花
-        {"rank": "J", "suit": "d"}   # J♦
+    examples = [
+        # 範例1: 一手好牌
+        ("範例1: 一手好牌（對子 + 同花）", [
+            {"rank": "A", "suit": "s"},  # A♠
+            {"rank": "A", "suit": "h"},  # A♥ - 對子
+            {"rank": "K", "suit": "s"},  # K♠ - 同花
+            {"rank": "Q", "suit": "s"},  # Q♠ - 同花
+            {"rank": "J", "suit": "d"}   # J♦
+        ]),
+        # 範例2: 順子潛力
+        ("範例2: 順子潛力牌", [
+            {"rank": "9", "suit": "h"},   # 9♥
+            {"rank": "8", "suit": "d"},   # 8♦
+            {"rank": "7", "suit": "s"},   # 7♠
+            {"rank": "6", "suit": "c"},   # 6♣
+            {"rank": "4", "suit": "h"}    # 4♥
+        ]),
+        # 範例3: 散牌
+        ("範例3: 散牌（高牌）", [
+            {"rank": "A", "suit": "d"},   # A♦
+            {"rank": "K", "suit": "c"},   # K♣
+            {"rank": "J", "suit": "h"},   # J♥
+            {"rank": "7", "suit": "s"},   # 7♠
+            {"rank": "3", "suit": "d"}    # 3♦
+        ]),
     ]
-    result_1 = solve_initial_five_cards(cards_1, time_limit=10.0)
-    print_result(result_1)
-    
-    print("\n" + "="*50 + "\n")
-    
-    # 範例2: 順子潛力
-    print("範例2: 順子潛力牌")
-    cards_2 = [
-        {"rank": "9", "suit": "h"},   # 9♥
-        {"rank": "8", "suit": "d"},   # 8♦
-        {"rank": "7", "suit": "s"},   # 7♠
-        {"rank": "6", "suit": "c"},   # 6♣
-        {"rank": "4", "suit": "h"}    # 4♥
-    ]
-    result_2 = solve_initial_five_cards(cards_2, time_limit=10.0)
-    print_result(result_2)
-    
-    print("\n" + "="*50 + "\n")
-    
-    # 範例3: 散牌
-    print("範例3: 散牌（高牌）")
-    cards_3 = [
-        {"rank": "A", "suit": "d"},   # A♦
-        {"rank": "K", "suit": "c"},   # K♣
-        {"rank": "J", "suit": "h"},   # J♥
-        {"rank": "7", "suit": "s"},   # 7♠
-        {"rank": "3", "suit": "d"}    # 3♦
-    ]
-    result_3 = solve_initial_five_cards(cards_3, time_limit=10.0)
-    print_result(result_3)
+    
+    # 三個局面互相獨立，同時送出請求，總耗時約等於單次求解時間
+    with ThreadPoolExecutor(max_workers=len(examples)) as executor:
+        futures = [
+            executor.submit(solve_initial_five_cards, cards, time_limit=10.0)
+            for _, cards in examples
+        ]
+        
+        # 依原順序打印結果
+        for i, ((title, _), future) in enumerate(zip(examples, futures)):
+            if i:
+                print("\n" + "="*50 + "\n")
+            print(title)
+            print_result(*future.result())
 
 
 if __name__ == "__main__":
-    # 檢查 API 是否運行
+    # 檢查 API 是否運行（同時預熱共用連線，第一次求解可直接重用）
     try:
-        health_check = requests.get("http://localhost:8000/api/v1/health")
+        health_check = _SESSION.get("http://localhost:8000/api/v1/health", timeout=2.0)
         if health_check.status_code != 200:
             print("❌ 錯誤: API 服務器未運行")
             print("請先運行: python run_api.py")
             exit(1)
-    except requests.exceptions.ConnectionError:
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
         print("❌ 錯誤: 無法連接到 API 服務器")
         print("請先運行: python run_api.py")
         exit(1)
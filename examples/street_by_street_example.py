@@ -5,7 +5,9 @@
 """
 
 import sys
+import multiprocessing
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 sys.path.append(str(Path(__file__).parent.parent))
 
 from ofc_solver_street import (
@@ -14,19 +16,99 @@ from ofc_solver_street import (
     InitialStreetSolver, DrawStreetSolver
 )
 from ofc_solver_joker import create_full_deck
-import random
+
+import numpy as np
+
+# 對手擺牌優先順序及各墩容量（後墩、中墩、前墩）
+POS_NAMES = ('back', 'middle', 'front')
+_POS_CAPACITY = np.array([5, 5, 3], dtype=np.int8)
+
+
+class DeckView(Sequence):
+    """剩餘牌堆的唯讀視圖，按需把 uint8 索引轉成 Card"""
+    
+    __slots__ = ('_indices', '_cards')
+    
+    def __init__(self, indices: np.ndarray, cards: List[Card]):
+        self._indices = indices
+        self._cards = cards
+    
+    def __len__(self) -> int:
+        return len(self._indices)
+    
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._cards[j] for j in self._indices[i]]
+        return self._cards[self._indices[i]]
 
 
 class InteractiveOFCGame:
     """交互式 OFC 遊戲"""
     
-    def __init__(self, include_jokers: bool = True):
+    # 每種鬼牌模式共用一份唯讀牌堆模板及索引→Card 對照表
+    _DECK_TEMPLATES: Dict[bool, Tuple[np.ndarray, List[Card]]] = {}
+    
+    def __init__(self, include_jokers: bool = True, seed: Optional[int] = None,
+                 auto: bool = False, num_workers: int = 1):
         self.solver = StreetByStreetSolver(include_jokers=include_jokers)
+        # 可選的進程池（num_workers > 1 時建立一次並在整個遊戲循環中重用）。
+        # 每街最多評估27個動作，單進程遠比進程間傳遞狀態便宜，所以預設不開啟
+        self._pool = multiprocessing.Pool(num_workers) if num_workers > 1 else None
+        self.solver.draw_solver.pool = self._pool
+        self.solver.draw_solver.num_workers = num_workers
         self.player_state = PineappleState()
         self.opponent_tracker = OpponentTracker()
-        self.deck = []
         self.include_jokers = include_jokers
-        
+        # 自動模式：直接接受求解器建議，不讀取用戶輸入
+        self._auto = auto
+        # 牌堆以 uint8 索引保存，_idx_to_card 只在顯示和交給求解器時查表
+        self._deck_template, self._idx_to_card = self._get_deck_template(include_jokers)
+        # 所有隨機操作共用一個 SFC64 生成器，指定 seed 可重現整局
+        self._rng = np.random.Generator(np.random.SFC64(seed))
+        self.deck = np.empty(0, dtype=np.uint8)
+        self._cursor = 0
+        # 每街抽牌重用的緩衝區（初始街5張、抽牌街3張）
+        self._street_bufs = {5: [None] * 5, 3: [None] * 3}
+        
+    def close(self):
+        """關閉進程池"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self.solver.draw_solver.pool = None
+    
+    def run_game(self, seed: Optional[int] = None) -> Dict[str, Any]:
+        """無需輸入地跑完一局（自動接受求解器建議），返回最終牌面"""
+        if seed is not None:
+            self._rng = np.random.Generator(np.random.SFC64(seed))
+        auto, self._auto = self._auto, True
+        try:
+            self.start_new_game()
+        finally:
+            self._auto = auto
+        
+        state = self.player_state
+        return {
+            'front': [str(c) for c in state.front_hand.cards],
+            'middle': [str(c) for c in state.middle_hand.cards],
+            'back': [str(c) for c in state.back_hand.cards],
+            'discarded': [str(c) for c in state.discarded],
+            'is_valid': state.is_valid(),
+            'fantasy_land': state.has_fantasy_land()
+        }
+    
+    @classmethod
+    def _get_deck_template(cls, include_jokers: bool) -> Tuple[np.ndarray, List[Card]]:
+        """取得（必要時建立）牌堆模板"""
+        template = cls._DECK_TEMPLATES.get(include_jokers)
+        if template is None:
+            cards = create_full_deck(include_jokers=include_jokers)
+            indices = np.arange(len(cards), dtype=np.uint8)
+            indices.flags.writeable = False
+            template = cls._DECK_TEMPLATES[include_jokers] = (indices, cards)
+        return template
+    
     def start_new_game(self):
         """開始新遊戲"""
         print("\n" + "="*60)
@@ -34,8 +116,9 @@ class InteractiveOFCGame:
         print("="*60)
         
         # 初始化牌堆
-        self.deck = create_full_deck(include_jokers=self.include_jokers)
-        random.shuffle(self.deck)
+        self.deck = self._deck_template.copy()
+        self._rng.shuffle(self.deck)
+        self._cursor = len(self.deck)
         
         # 重置狀態
         self.player_state = PineappleState()
@@ -52,20 +135,37 @@ class InteractiveOFCGame:
         # 顯示最終結果
         self.show_final_results()
     
+    def _draw(self, n: int) -> List[Card]:
+        """從牌堆頂抽n張牌（只移動游標，不複製牌堆）
+        
+        返回的列表是重用的緩衝區，下一次抽同樣張數時會被覆寫。
+        """
+        cards = self._street_bufs[n]
+        for i in range(n):
+            self._cursor -= 1
+            cards[i] = self._idx_to_card[self.deck[self._cursor]]
+        return cards
+    
+    def _remaining_view(self) -> DeckView:
+        """剩餘牌堆的零拷貝唯讀視圖"""
+        indices = self.deck[:self._cursor]
+        indices.flags.writeable = False
+        return DeckView(indices, self._idx_to_card)
+    
     def play_initial_street(self):
         """玩初始街道"""
         print("\n--- 初始街道（5張牌）---")
         
         # 玩家抽5張
-        player_cards = [self.deck.pop() for _ in range(5)]
-        print(f"你抽到: {' '.join(str(c) for c in player_cards)}")
+        player_cards = self._draw(5)
+        print(f"你抽到: {' '.join(map(str, player_cards))}")
         
         # 創建街道狀態
         street_state = StreetState(
             street=Street.INITIAL,
             player_state=self.player_state,
             opponent_tracker=self.opponent_tracker,
-            remaining_deck=self.deck.copy(),
+            remaining_deck=self._remaining_view(),
             street_cards=player_cards
         )
         
@@ -100,20 +200,20 @@ class InteractiveOFCGame:
         print(f"\n--- {street_name}街（抽3張，擺2張，棄1張）---")
         
         # 檢查牌堆
-        if len(self.deck) < 6:  # 玩家3張 + 對手3張
+        if self._cursor < 6:  # 玩家3張 + 對手3張
             print("牌堆不足，遊戲結束！")
             return False
         
         # 玩家抽3張
-        player_cards = [self.deck.pop() for _ in range(3)]
-        print(f"你抽到: {' '.join(str(c) for c in player_cards)}")
+        player_cards = self._draw(3)
+        print(f"你抽到: {' '.join(map(str, player_cards))}")
         
         # 創建街道狀態
         street_state = StreetState(
             street=Street(street_num),
             player_state=self.player_state,
             opponent_tracker=self.opponent_tracker,
-            remaining_deck=self.deck.copy(),
+            remaining_deck=self._remaining_view(),
             street_cards=player_cards
         )
         
@@ -150,7 +250,7 @@ class InteractiveOFCGame:
         
         cards_left = cards.copy()
         while cards_left:
-            print(f"\n剩餘牌: {' '.join(str(c) for c in cards_left)}")
+            print(f"\n剩餘牌: {' '.join(map(str, cards_left))}")
             print("可用位置:", self.player_state.get_available_positions())
             
             # 選擇牌
@@ -174,7 +274,7 @@ class InteractiveOFCGame:
         print("\n手動擺放模式:")
         
         # 選擇棄牌
-        print(f"抽到的牌: {' '.join(str(c) for c in cards)}")
+        print(f"抽到的牌: {' '.join(map(str, cards))}")
         discard_idx = self.get_user_choice("選擇要棄掉的牌（輸入序號）:", 3)
         
         cards_to_place = []
@@ -204,17 +304,17 @@ class InteractiveOFCGame:
                 print("該位置已滿！請重新選擇")
                 # 簡化處理，隨機選一個可用位置
                 if positions:
-                    position = random.choice(positions)
+                    position = positions[self._rng.integers(len(positions))]
                     self.player_state.place_card(card, position)
                     print(f"自動將 {card} 擺放到 {position}")
     
     def simulate_opponent_initial(self):
         """模擬對手初始擺放"""
-        if len(self.deck) < 5:
+        if self._cursor < 5:
             return
         
         print("\n對手擺放初始5張牌...")
-        opponent_cards = [self.deck.pop() for _ in range(5)]
+        opponent_cards = self._draw(5)
         
         # 簡單策略
         positions = ['back', 'back', 'middle', 'middle', 'front']
@@ -223,32 +323,28 @@ class InteractiveOFCGame:
     
     def simulate_opponent_draw(self):
         """模擬對手抽牌"""
-        if len(self.deck) < 3:
+        if self._cursor < 3:
             return
         
         print("\n對手抽3張牌...")
-        opponent_cards = [self.deck.pop() for _ in range(3)]
+        opponent_cards = self._draw(3)
         
         # 隨機選2張擺放
-        random.shuffle(opponent_cards)
-        cards_to_place = opponent_cards[:2]
-        
-        # 獲取對手可用位置
-        summary = self.opponent_tracker.get_opponent_state_summary()
-        positions = []
-        
-        if summary['back'] < 5:
-            positions.extend(['back'] * (5 - summary['back']))
-        if summary['middle'] < 5:
-            positions.extend(['middle'] * (5 - summary['middle']))
-        if summary['front'] < 3:
-            positions.extend(['front'] * (3 - summary['front']))
-        
-        # 擺放
-        for card in cards_to_place[:2]:
-            if positions:
-                pos = positions.pop(0)
-                self.opponent_tracker.add_known_card(card, pos)
+        self._rng.shuffle(opponent_cards)
+        
+        # 獲取對手各墩剩餘空位
+        tracker = self.opponent_tracker
+        remaining = _POS_CAPACITY - np.array(tracker.position_counts()[::-1], dtype=np.int8)
+        
+        # 擺放：游標只往前走，依序填入第一個還有空位的墩
+        slot = 0
+        for card in opponent_cards[:2]:
+            while slot < len(POS_NAMES) and remaining[slot] <= 0:
+                slot += 1
+            if slot == len(POS_NAMES):
+                break
+            tracker.add_known_card(card, POS_NAMES[slot])
+            remaining[slot] -= 1
     
     def show_current_state(self):
         """顯示當前遊戲狀態"""
@@ -258,21 +354,21 @@ class InteractiveOFCGame:
         
         # 玩家狀態
         print("你的牌:")
-        print(f"  前墩({len(self.player_state.front_hand.cards)}/3): {' '.join(str(c) for c in self.player_state.front_hand.cards)}")
-        print(f"  中墩({len(self.player_state.middle_hand.cards)}/5): {' '.join(str(c) for c in self.player_state.middle_hand.cards)}")
-        print(f"  後墩({len(self.player_state.back_hand.cards)}/5): {' '.join(str(c) for c in self.player_state.back_hand.cards)}")
+        print(f"  前墩({len(self.player_state.front_hand.cards)}/3): {' '.join(map(str, self.player_state.front_hand.cards))}")
+        print(f"  中墩({len(self.player_state.middle_hand.cards)}/5): {' '.join(map(str, self.player_state.middle_hand.cards))}")
+        print(f"  後墩({len(self.player_state.back_hand.cards)}/5): {' '.join(map(str, self.player_state.back_hand.cards))}")
         
         if self.player_state.discarded:
-            print(f"  棄牌: {' '.join(str(c) for c in self.player_state.discarded)}")
+            print(f"  棄牌: {' '.join(map(str, self.player_state.discarded))}")
         
         # 對手狀態
-        summary = self.opponent_tracker.get_opponent_state_summary()
+        front, middle, back = self.opponent_tracker.position_counts()
         print(f"\n對手的牌:")
-        print(f"  前墩: {summary['front']}/3 張")
-        print(f"  中墩: {summary['middle']}/5 張")
-        print(f"  後墩: {summary['back']}/5 張")
+        print(f"  前墩: {front}/3 張")
+        print(f"  中墩: {middle}/5 張")
+        print(f"  後墩: {back}/5 張")
         
-        print(f"\n牌堆剩餘: {len(self.deck)} 張")
+        print(f"\n牌堆剩餘: {self._cursor} 張")
         print("-"*40)
     
     def show_final_results(self):
@@ -283,15 +379,15 @@ class InteractiveOFCGame:
         
         # 玩家結果
         print("\n你的最終牌型:")
-        print(f"前墩: {' '.join(str(c) for c in self.player_state.front_hand.cards)}")
+        print(f"前墩: {' '.join(map(str, self.player_state.front_hand.cards))}")
         front_rank, _ = self.player_state.front_hand.evaluate()
         print(f"  牌力: {self.get_hand_name(front_rank)}")
         
-        print(f"\n中墩: {' '.join(str(c) for c in self.player_state.middle_hand.cards)}")
+        print(f"\n中墩: {' '.join(map(str, self.player_state.middle_hand.cards))}")
         middle_rank, _ = self.player_state.middle_hand.evaluate()
         print(f"  牌力: {self.get_hand_name(middle_rank)}")
         
-        print(f"\n後墩: {' '.join(str(c) for c in self.player_state.back_hand.cards)}")
+        print(f"\n後墩: {' '.join(map(str, self.player_state.back_hand.cards))}")
         back_rank, _ = self.player_state.back_hand.evaluate()
         print(f"  牌力: {self.get_hand_name(back_rank)}")
         
@@ -314,6 +410,8 @@ class InteractiveOFCGame:
     
     def ask_user_confirmation(self, prompt: str) -> bool:
         """詢問用戶確認"""
+        if self._auto:
+            return True
         response = input(f"\n{prompt} (y/n): ").lower()
         return response == 'y'
     
@@ -329,6 +427,13 @@ class InteractiveOFCGame:
                 print("請輸入數字")
 
 
+def run_one_game(seed: int, include_jokers: bool = True) -> Dict[str, Any]:
+    """自動跑一局（可供 multiprocessing.Pool.map 批量自我對局）"""
+    # 在進程池的工作進程中不再建立子進程池
+    game = InteractiveOFCGame(include_jokers=include_jokers, auto=True, num_workers=1)
+    return game.run_game(seed)
+
+
 def main():
     """主函數"""
     print("歡迎來到 OFC Pineapple 逐街求解器！")
@@ -340,13 +445,16 @@ def main():
     # 創建遊戲
     game = InteractiveOFCGame(include_jokers=include_jokers)
     
-    while True:
-        # 開始新遊戲
-        game.start_new_game()
-        
-        # 詢問是否繼續
-        if not game.ask_user_confirmation("再來一局？"):
-            break
+    try:
+        while True:
+            # 開始新遊戲
+            game.start_new_game()
+            
+            # 詢問是否繼續
+            if not game.ask_user_confirmation("再來一局？"):
+                break
+    finally:
+        game.close()
     
     print("\n感謝遊玩！再見！")
 
@@ -4,20 +4,29 @@
 生成用於 GUI 測試的測試數據和場景
 """
 
-import json
 import os
 from datetime import datetime
 from typing import List, Dict, Any
 
+from json_compat import dumps
+
+
+def _write_json(path: str, obj: Any) -> None:
+    """Write obj as indented JSON."""
+    with open(path, 'wb') as f:
+        f.write(dumps(obj, indent=True))
+
 def generate_test_game_states():
     """生成測試用的遊戲狀態"""
     test_states = []
+    # 所有狀態共用同一個生成時間戳
+    now = datetime.now().isoformat()
     
     # 1. 初始狀態
     test_states.append({
         "name": "initial_state",
         "description": "遊戲初始狀態",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now,
         "game_state": {
             "front": [],
             "middle": [],
@@ -35,7 +44,7 @@ def generate_test_game_states():
     test_states.append({
         "name": "partial_game",
         "description": "部分完成的遊戲",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now,
         "game_state": {
             "front": ["Ah", "Kh", "Qh"],
             "middle": ["Jh", "10h", "9h", "8h"],
@@ -53,7 +62,7 @@ def generate_test_game_states():
     test_states.append({
         "name": "fantasy_land",
         "description": "達到 Fantasy Land 的狀態",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now,
         "game_state": {
             "front": ["Qh", "Qd", "Kh"],
             "middle": ["Ah", "Ad", "Ac", "Kd", "Kc"],
@@ -71,7 +80,7 @@ def generate_test_game_states():
     test_states.append({
         "name": "foul_state",
         "description": "犯規的遊戲狀態",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now,
         "game_state": {
             "front": ["Ah", "Ad", "Ac"],  # 三條在前墩
             "middle": ["Kh", "Kd", "Qh", "Qd", "Jh"],  # 兩對在中墩
@@ -89,7 +98,7 @@ def generate_test_game_states():
     test_states.append({
         "name": "with_jokers",
         "description": "包含鬼牌的遊戲",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now,
         "game_state": {
             "front": ["Xj", "Ah", "Kh"],  # 鬼牌在前墩
             "middle": ["Qh", "Qd", "Qc", "Jh", "Jd"],
@@ -250,20 +259,17 @@ def save_test_data():
     
     # 保存遊戲狀態
     game_states = generate_test_game_states()
-    with open(os.path.join(test_data_dir, "test_game_states.json"), 'w') as f:
-        json.dump(game_states, f, indent=2)
+    _write_json(os.path.join(test_data_dir, "test_game_states.json"), game_states)
     print(f"Generated {len(game_states)} test game states")
     
     # 保存測試場景
     scenarios = generate_test_scenarios()
-    with open(os.path.join(test_data_dir, "test_scenarios.json"), 'w') as f:
-        json.dump(scenarios, f, indent=2)
+    _write_json(os.path.join(test_data_dir, "test_scenarios.json"), scenarios)
     print(f"Generated {len(scenarios)} test scenarios")
     
     # 保存性能測試數據
     perf_data = generate_performance_test_data()
-    with open(os.path.join(test_data_dir, "performance_test_data.json"), 'w') as f:
-        json.dump(perf_data, f, indent=2)
+    _write_json(os.path.join(test_data_dir, "performance_test_data.json"), perf_data)
     print("Generated performance test data")
     
     # 生成測試報告模板
@@ -285,8 +291,7 @@ def save_test_data():
         "test_cases": []
     }
     
-    with open(os.path.join(test_data_dir, "report_template.json"), 'w') as f:
-        json.dump(report_template, f, indent=2)
+    _write_json(os.path.join(test_data_dir, "report_template.json"), report_template)
     print("Generated report template")
 
 if __name__ == "__main__":
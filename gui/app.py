@@ -2,12 +2,17 @@
 OFC Solver Web GUI - 基於 Streamlit 的圖形界面
 """
 
+import sys
+import os
 import streamlit as st
 import requests
-import json
 from typing import List, Dict, Any
+from requests.adapters import HTTPAdapter
 import pandas as pd
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from json_compat import dumps, loads
+
 # 設定頁面
 st.set_page_config(
     page_title="OFC Solver GUI",
@@ -23,14 +28,35 @@ API_KEY = "test_key"
 RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
 SUITS = {'s': '♠', 'h': '♥', 'd': '♦', 'c': '♣'}
 SUIT_COLORS = {'s': 'black', 'h': 'red', 'd': 'red', 'c': 'black'}
+# 52張標準牌的預建字典，parse_cards 直接查表（共用物件，只讀）
+_CARD_DICTS = {r + s: {"rank": r, "suit": s} for r in RANKS for s in SUITS}
+# 每張牌的顯示 HTML，card_to_display 直接查表
+CARD_HTML = {
+    (r, s): f"<span style='color: {SUIT_COLORS[s]}; font-size: 24px;'>{r}{SUITS[s]}</span>"
+    for r in RANKS for s in SUITS
+}
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """跨重新執行共用的 HTTP 會話，連續求解重用同一個 keep-alive 連接"""
+    session = requests.Session()
+    session.headers.update({
+        "X-API-Key": API_KEY,
+        "Content-Type": "application/json",
+        "Connection": "keep-alive"
+    })
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    return session
 
 def card_to_display(card: Dict[str, str]) -> str:
     """將卡牌轉換為顯示格式"""
     rank = card['rank']
     suit = card['suit']
-    symbol = SUITS[suit]
-    color = SUIT_COLORS[suit]
-    return f"<span style='color: {color}; font-size: 24px;'>{rank}{symbol}</span>"
+    html = CARD_HTML.get((rank, suit))
+    if html is None:
+        html = f"<span style='color: {SUIT_COLORS[suit]}; font-size: 24px;'>{rank}{SUITS[suit]}</span>"
+    return html
 
 def cards_to_string(cards: List[str]) -> str:
     """將卡牌列表轉換為字符串"""
@@ -41,13 +67,9 @@ def parse_cards(cards_str: str) -> List[Dict[str, str]]:
     if not cards_str:
         return []
     
-    cards = []
-    for card in cards_str.split():
-        if len(card) == 2:
-            rank = card[0]
-            suit = card[1]
-            cards.append({"rank": rank, "suit": suit})
-    return cards
+    lookup = _CARD_DICTS.get
+    return [lookup(card) or {"rank": card[0], "suit": card[1]}
+            for card in cards_str.split() if len(card) == 2]
 
 def create_game_state(drawn_cards: List[Dict[str, str]], 
                      player1_cards: Dict[str, List[Dict[str, str]]],
@@ -94,10 +116,10 @@ def main():
         st.header("📊 API 狀態")
         if st.button("檢查連接"):
             try:
-                response = requests.get(f"{API_URL}/api/v1/health")
+                response = get_session().get(f"{API_URL}/api/v1/health")
                 if response.status_code == 200:
                     st.success("✅ API 連接正常")
-                    data = response.json()
+                    data = loads(response.content)
                     st.json(data)
                 else:
                     st.error("❌ API 連接失敗")
@@ -156,21 +178,20 @@ def main():
                             game_state = create_game_state(drawn_cards, player1_cards, player2_cards)
                             
                             # 調用 API
-                            response = requests.post(
+                            response = get_session().post(
                                 f"{API_URL}/api/v1/solve",
-                                json={
+                                data=dumps({
                                     "game_state": game_state,
                                     "options": {
                                         "time_limit": time_limit,
                                         "threads": threads,
                                         "simulations": simulations
                                     }
-                                },
-                                headers={"X-API-Key": API_KEY}
+                                })
                             )
                             
                             if response.status_code == 200:
-                                result = response.json()
+                                result = loads(response.content)
                                 st.session_state['last_result'] = result
                                 st.success("✅ 求解完成！")
                             else:
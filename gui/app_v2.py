@@ -2,11 +2,17 @@
 OFC Solver Web GUI V2 - 點擊式卡牌輸入界面
 """
 
+import sys
+import os
 import streamlit as st
+import streamlit.components.v1 as components
 import requests
-import json
-from typing import List, Dict, Any, Optional, Set
-import pandas as pd
+from typing import List, Dict, Any, Optional, Set, Tuple
+from dataclasses import dataclass
+from requests.adapters import HTTPAdapter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from json_compat import dumps, loads
 
 # 設定頁面
 st.set_page_config(
@@ -24,12 +30,40 @@ RANKS = ['A', 'K', 'Q', 'J', 'T', '9', '8', '7', '6', '5', '4', '3', '2']
 SUITS = ['s', 'h', 'd', 'c']
 SUIT_SYMBOLS = {'s': '♠', 'h': '♥', 'd': '♦', 'c': '♣'}
 SUIT_COLORS = {'s': '#000000', 'h': '#FF0000', 'd': '#FF0000', 'c': '#000000'}
+# 輸入目標 → (session_state 中的玩家鍵, 墩位, 容量)
+HANDS = ('top', 'middle', 'bottom')
+TARGET_HAND = {f"{p}_{h}": h for p in ('p1', 'p2') for h in HANDS}
+TARGET_MAX = {k: (3 if h == 'top' else 5) for k, h in TARGET_HAND.items()}
+TARGET_PLAYER = {k: ('player1_cards' if k.startswith('p1') else 'player2_cards') for k in TARGET_HAND}
+# 牌局狀態顯示用的標籤
+HAND_LABELS = (('top', '前墩'), ('middle', '中墩'), ('bottom', '後墩'))
+PLAYER_LABELS = (('p1', '👤 玩家1'), ('p2', '🤖 玩家2'))
+# 移除按鈕列的固定欄數（佈局不隨牌數改變）
+REMOVE_COLUMNS = 13
+# 卡牌網格組件：52張牌在一個 HTML 組件中繪製，只有點擊事件回傳給 Python
+_card_grid = components.declare_component(
+    "card_grid", path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "card_grid")
+)
+_GRID_SUITS = [[s, SUIT_SYMBOLS[s], SUIT_COLORS[s]] for s in SUITS]
+RANK_IDX = {r: i for i, r in enumerate(RANKS)}
+SUIT_IDX = {s: i for i, s in enumerate(SUITS)}
+
+@dataclass(frozen=True)
+class Card:
+    """已選擇的卡牌"""
+    __slots__ = ('rank', 'suit')
+    rank: str
+    suit: str
+    
+    def to_json(self) -> Dict[str, str]:
+        """API 請求使用的卡牌字典"""
+        return {"rank": self.rank, "suit": self.suit}
 
 # 初始化 session state
 if 'selected_cards' not in st.session_state:
     st.session_state.selected_cards = []
-if 'used_cards' not in st.session_state:
-    st.session_state.used_cards = set()
+if 'used_mask' not in st.session_state:
+    st.session_state.used_mask = 0  # 第 card_id 位為1表示該牌已使用
 if 'player1_cards' not in st.session_state:
     st.session_state.player1_cards = {'top': [], 'middle': [], 'bottom': []}
 if 'player2_cards' not in st.session_state:
@@ -37,6 +71,28 @@ if 'player2_cards' not in st.session_state:
 if 'current_input_target' not in st.session_state:
     st.session_state.current_input_target = 'drawn'
 
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """跨重新執行共用的 HTTP 會話，健康檢查和求解重用 keep-alive 連接"""
+    session = requests.Session()
+    session.headers.update({"X-API-Key": API_KEY})
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    return session
+
+@st.cache_data(ttl=10)
+def probe_health() -> Optional[bool]:
+    """檢查 API 健康狀態（結果快取10秒）；無法連接時返回 None"""
+    try:
+        response = get_session().get(f"{API_URL}/api/v1/health", timeout=2)
+    except requests.RequestException:
+        return None
+    return response.status_code == 200
+
+def card_id(rank: str, suit: str) -> int:
+    """卡牌的整數編號 (0-51)，即 used_mask 中的位元位置"""
+    return RANK_IDX[rank] * 4 + SUIT_IDX[suit]
+
 def card_to_string(rank: str, suit: str) -> str:
     """將卡牌轉換為字符串格式"""
     return f"{rank}{suit}"
@@ -47,18 +103,18 @@ def string_to_card(card_str: str) -> Dict[str, str]:
         return {"rank": card_str[0], "suit": card_str[1]}
     return None
 
-def display_card(rank: str, suit: str, size: str = "medium") -> str:
-    """生成卡牌的 HTML 顯示"""
+# 卡牌尺寸：(寬, 高, 字體大小)
+CARD_SIZES = {
+    "small": ("40px", "60px", "16px"),
+    "medium": ("50px", "70px", "20px"),
+    "large": ("60px", "80px", "24px")
+}
+
+def _render_card(rank: str, suit: str, size: str) -> str:
+    """生成卡牌的 HTML"""
     symbol = SUIT_SYMBOLS[suit]
     color = SUIT_COLORS[suit]
-    card_str = card_to_string(rank, suit)
-    
-    sizes = {
-        "small": ("40px", "60px", "16px"),
-        "medium": ("50px", "70px", "20px"),
-        "large": ("60px", "80px", "24px")
-    }
-    width, height, font_size = sizes[size]
+    width, height, font_size = CARD_SIZES[size]
     
     return f"""
     <div style="
@@ -81,98 +137,189 @@ def display_card(rank: str, suit: str, size: str = "medium") -> str:
     </div>
     """
 
+# 52張牌 × 3種尺寸的 HTML 在載入時生成一次
+CARD_HTML = {
+    (rank, suit, size): _render_card(rank, suit, size)
+    for rank in RANKS for suit in SUITS for size in CARD_SIZES
+}
+
+def display_card(rank: str, suit: str, size: str = "medium") -> str:
+    """生成卡牌的 HTML 顯示"""
+    html = CARD_HTML.get((rank, suit, size))
+    if html is None:
+        html = _render_card(rank, suit, size)
+    return html
+
 def is_card_used(rank: str, suit: str) -> bool:
     """檢查卡牌是否已被使用"""
-    card_str = card_to_string(rank, suit)
-    return card_str in st.session_state.used_cards
+    return bool(st.session_state.used_mask >> card_id(rank, suit) & 1)
 
 def add_card_to_target(rank: str, suit: str):
     """將卡牌添加到目標位置"""
-    card_str = card_to_string(rank, suit)
-    card_dict = {"rank": rank, "suit": suit}
+    state = st.session_state
+    card = Card(rank, suit)
+    cid = card_id(rank, suit)
     
     # 檢查是否已使用
-    if is_card_used(rank, suit):
+    if state.used_mask >> cid & 1:
         st.error(f"卡牌 {rank}{SUIT_SYMBOLS[suit]} 已經被使用！")
         return
     
-    target = st.session_state.current_input_target
+    target = state.current_input_target
     
     # 添加到對應位置
     if target == 'drawn':
-        st.session_state.selected_cards.append(card_dict)
-    elif target.startswith('p1_'):
-        hand = target.split('_')[1]
-        max_cards = 3 if hand == 'top' else 5
-        if len(st.session_state.player1_cards[hand]) < max_cards:
-            st.session_state.player1_cards[hand].append(card_dict)
-        else:
-            st.error(f"玩家1的{hand}墩已滿！")
-            return
-    elif target.startswith('p2_'):
-        hand = target.split('_')[1]
-        max_cards = 3 if hand == 'top' else 5
-        if len(st.session_state.player2_cards[hand]) < max_cards:
-            st.session_state.player2_cards[hand].append(card_dict)
-        else:
-            st.error(f"玩家2的{hand}墩已滿！")
+        state.selected_cards.append(card)
+        # 重新執行競爭時可能重複加入，按順序去重（Card 可雜湊）
+        state.selected_cards = list(dict.fromkeys(state.selected_cards))
+    else:
+        hand = TARGET_HAND[target]
+        cards = state[TARGET_PLAYER[target]][hand]
+        if len(cards) >= TARGET_MAX[target]:
+            st.error(f"玩家{target[1]}的{hand}墩已滿！")
             return
+        cards.append(card)
     
     # 標記為已使用
-    st.session_state.used_cards.add(card_str)
+    state.used_mask |= 1 << cid
 
-def remove_card(card_dict: Dict[str, str], source: str):
+def remove_card(source: str, index: int):
     """移除卡牌"""
-    card_str = card_to_string(card_dict['rank'], card_dict['suit'])
-    
     if source == 'drawn':
-        st.session_state.selected_cards.remove(card_dict)
-    elif source.startswith('p1_'):
-        hand = source.split('_')[1]
-        st.session_state.player1_cards[hand].remove(card_dict)
-    elif source.startswith('p2_'):
-        hand = source.split('_')[1]
-        st.session_state.player2_cards[hand].remove(card_dict)
+        card = st.session_state.selected_cards.pop(index)
+    else:
+        card = st.session_state[TARGET_PLAYER[source]][TARGET_HAND[source]].pop(index)
     
     # 從已使用列表中移除
-    st.session_state.used_cards.discard(card_str)
+    st.session_state.used_mask &= ~(1 << card_id(card.rank, card.suit))
 
 def clear_all():
     """清空所有選擇"""
-    st.session_state.selected_cards = []
-    st.session_state.player1_cards = {'top': [], 'middle': [], 'bottom': []}
-    st.session_state.player2_cards = {'top': [], 'middle': [], 'bottom': []}
-    st.session_state.used_cards = set()
+    state = st.session_state
+    state.selected_cards = []
+    state.player1_cards = {'top': [], 'middle': [], 'bottom': []}
+    state.player2_cards = {'top': [], 'middle': [], 'bottom': []}
+    state.used_mask = 0
 
-def create_game_state() -> Dict[str, Any]:
-    """創建遊戲狀態"""
+def _card_dict(cid: int) -> Dict[str, str]:
+    """card_id 轉回 API 請求使用的卡牌字典"""
+    return {"rank": RANKS[cid >> 2], "suit": SUITS[cid & 3]}
+
+def _card_ids(cards) -> Tuple[int, ...]:
+    """卡牌列表轉為 card_id 元組（可雜湊，作為快取鍵）"""
+    return tuple(card_id(c.rank, c.suit) for c in cards)
+
+@st.cache_data(max_entries=8)
+def _game_state_cached(used_mask: int,
+                       p1_top: Tuple[int, ...], p1_mid: Tuple[int, ...], p1_bot: Tuple[int, ...],
+                       p2_top: Tuple[int, ...], p2_mid: Tuple[int, ...], p2_bot: Tuple[int, ...],
+                       drawn: Tuple[int, ...]) -> Dict[str, Any]:
+    """以牌的編號為鍵快取遊戲狀態，牌局未變時重複求解不會重建字典"""
+    p1 = {'top': list(map(_card_dict, p1_top)), 'middle': list(map(_card_dict, p1_mid)),
+          'bottom': list(map(_card_dict, p1_bot))}
+    p2 = {'top': list(map(_card_dict, p2_top)), 'middle': list(map(_card_dict, p2_mid)),
+          'bottom': list(map(_card_dict, p2_bot))}
+    drawn = list(map(_card_dict, drawn))
     return {
         "current_round": 1,
         "players": [
             {
                 "player_id": "player1",
-                "top_hand": {"cards": st.session_state.player1_cards['top'], "max_size": 3},
-                "middle_hand": {"cards": st.session_state.player1_cards['middle'], "max_size": 5},
-                "bottom_hand": {"cards": st.session_state.player1_cards['bottom'], "max_size": 5},
+                "top_hand": {"cards": p1['top'], "max_size": 3},
+                "middle_hand": {"cards": p1['middle'], "max_size": 5},
+                "bottom_hand": {"cards": p1['bottom'], "max_size": 5},
                 "in_fantasy_land": False,
                 "next_fantasy_land": False,
                 "is_folded": False
             },
             {
                 "player_id": "player2",
-                "top_hand": {"cards": st.session_state.player2_cards['top'], "max_size": 3},
-                "middle_hand": {"cards": st.session_state.player2_cards['middle'], "max_size": 5},
-                "bottom_hand": {"cards": st.session_state.player2_cards['bottom'], "max_size": 5},
+                "top_hand": {"cards": p2['top'], "max_size": 3},
+                "middle_hand": {"cards": p2['middle'], "max_size": 5},
+                "bottom_hand": {"cards": p2['bottom'], "max_size": 5},
                 "in_fantasy_land": False,
                 "next_fantasy_land": False,
                 "is_folded": False
             }
         ],
         "current_player_index": 0,
-        "drawn_cards": st.session_state.selected_cards,
+        "drawn_cards": drawn,
         "remaining_deck": []
     }
 
+def create_game_state() -> Dict[str, Any]:
+    """創建遊戲狀態"""
+    state = st.session_state
+    p1, p2 = state.player1_cards, state.player2_cards
+    return _game_state_cached(
+        state.used_mask,
+        _card_ids(p1['top']), _card_ids(p1['middle']), _card_ids(p1['bottom']),
+        _card_ids(p2['top']), _card_ids(p2['middle']), _card_ids(p2['bottom']),
+        _card_ids(state.selected_cards)
+    )
+
+def remove_buttons(source: str, count: int):
+    """一列移除按鈕：固定 13 欄佈局，只在前 count 欄放按鈕"""
+    cols = st.columns(REMOVE_COLUMNS)
+    for idx in range(min(count, REMOVE_COLUMNS)):
+        with cols[idx]:
+            if st.button("❌", key=f"remove_{source}_{idx}"):
+                remove_card(source, idx)
+                st.rerun(scope="fragment")
+
+@st.fragment
+def card_picker_fragment():
+    """卡牌選擇網格和當前牌局狀態（點選卡牌時只重新執行這一區塊）"""
+    # 卡牌選擇網格
+    st.subheader("點擊選擇卡牌")
+    
+    used_mask = st.session_state.used_mask
+    # 已使用的卡牌在網格中以停用按鈕顯示
+    click = _card_grid(
+        ranks=RANKS,
+        suits=_GRID_SUITS,
+        used=[cid for cid in range(52) if used_mask >> cid & 1],
+        key="card_grid",
+        default=None
+    )
+    # 組件會在每次重新執行時返回最後一次點擊，用 nonce 只處理新的點擊
+    if click and click['nonce'] != st.session_state.get('last_card_click'):
+        st.session_state.last_card_click = click['nonce']
+        add_card_to_target(click['rank'], click['suit'])
+        st.rerun(scope="fragment")
+    
+    # 顯示當前選擇的牌
+    st.divider()
+    st.subheader("📋 當前牌局狀態")
+    
+    # 當前抽到的牌
+    st.write("**📥 當前抽到的牌:**")
+    if st.session_state.selected_cards:
+        card_html = ""
+        for card in st.session_state.selected_cards:
+            card_html += display_card(card.rank, card.suit, "small")
+        card_html += f"<span style='margin-left: 10px;'>共 {len(st.session_state.selected_cards)} 張</span>"
+        st.markdown(card_html, unsafe_allow_html=True)
+        
+        remove_buttons('drawn', len(st.session_state.selected_cards))
+    else:
+        st.write("*未選擇*")
+    
+    # 雙方玩家的牌
+    for prefix, player_label in PLAYER_LABELS:
+        st.write(f"**{player_label}:**")
+        cards_by_hand = st.session_state[TARGET_PLAYER[f"{prefix}_top"]]
+        for hand, label in HAND_LABELS:
+            cards = cards_by_hand[hand]
+            target = f"{prefix}_{hand}"
+            st.write(f"- {label} ({len(cards)}/{TARGET_MAX[target]}):")
+            if cards:
+                card_html = ""
+                for card in cards:
+                    card_html += display_card(card.rank, card.suit, "small")
+                st.markdown(card_html, unsafe_allow_html=True)
+                remove_buttons(target, len(cards))
+
 def main():
     st.title("🍍 OFC Solver GUI - 點擊式界面")
     
@@ -185,15 +332,14 @@ def main():
         
         st.header("📊 API 狀態")
         if st.button("檢查連接"):
-            try:
-                response = requests.get(f"{API_URL}/api/v1/health")
-                if response.status_code == 200:
-                    st.success("✅ API 連接正常")
-                else:
-                    st.error("❌ API 連接失敗")
-            except:
+            healthy = probe_health()
+            if healthy:
+                st.success("✅ API 連接正常")
+            elif healthy is None:
                 st.error("❌ 無法連接到 API 服務器")
                 st.info("請確保運行了: python run_api.py")
+            else:
+                st.error("❌ API 連接失敗")
         
         st.divider()
         
@@ -231,88 +377,7 @@ def main():
         # 顯示當前選擇的目標
         st.info(f"當前輸入到: {target_options[st.session_state.current_input_target]}")
         
-        # 卡牌選擇網格
-        st.subheader("點擊選擇卡牌")
-        
-        for suit in SUITS:
-            st.write(f"**{SUIT_SYMBOLS[suit]} {suit.upper()}**")
-            cols = st.columns(13)
-            for idx, rank in enumerate(RANKS):
-                with cols[idx]:
-                    # 檢查是否已使用
-                    used = is_card_used(rank, suit)
-                    button_key = f"card_{rank}_{suit}"
-                    
-                    # 使用不同的樣式顯示已使用的卡牌
-                    if used:
-                        st.button(f"{rank}", key=button_key, disabled=True, use_container_width=True)
-                    else:
-                        if st.button(f"{rank}", key=button_key, use_container_width=True):
-                            add_card_to_target(rank, suit)
-                            st.rerun()
-        
-        # 顯示當前選擇的牌
-        st.divider()
-        st.subheader("📋 當前牌局狀態")
-        
-        # 當前抽到的牌
-        st.write("**📥 當前抽到的牌:**")
-        if st.session_state.selected_cards:
-            card_html = ""
-            for card in st.session_state.selected_cards:
-                card_html += display_card(card['rank'], card['suit'], "small")
-            card_html += f"<span style='margin-left: 10px;'>共 {len(st.session_state.selected_cards)} 張</span>"
-            st.markdown(card_html, unsafe_allow_html=True)
-            
-            # 移除按鈕
-            cols = st.columns(len(st.session_state.selected_cards))
-            for idx, card in enumerate(st.session_state.selected_cards):
-                with cols[idx]:
-                    if st.button(f"❌", key=f"remove_drawn_{idx}"):
-                        remove_card(card, 'drawn')
-                        st.rerun()
-        else:
-            st.write("*未選擇*")
-        
-        # 玩家1的牌
-        st.write("**👤 玩家1:**")
-        for hand, label in [('top', '前墩'), ('middle', '中墩'), ('bottom', '後墩')]:
-            cards = st.session_state.player1_cards[hand]
-            max_cards = 3 if hand == 'top' else 5
-            st.write(f"- {label} ({len(cards)}/{max_cards}):")
-            if cards:
-                card_html = ""
-                for card in cards:
-                    card_html += display_card(card['rank'], card['suit'], "small")
-                st.markdown(card_html, unsafe_allow_html=True)
-                
-                # 移除按鈕
-                cols = st.columns(len(cards))
-                for idx, card in enumerate(cards):
-                    with cols[idx]:
-                        if st.button(f"❌", key=f"remove_p1_{hand}_{idx}"):
-                            remove_card(card, f'p1_{hand}')
-                            st.rerun()
-        
-        # 玩家2的牌
-        st.write("**🤖 玩家2:**")
-        for hand, label in [('top', '前墩'), ('middle', '中墩'), ('bottom', '後墩')]:
-            cards = st.session_state.player2_cards[hand]
-            max_cards = 3 if hand == 'top' else 5
-            st.write(f"- {label} ({len(cards)}/{max_cards}):")
-            if cards:
-                card_html = ""
-                for card in cards:
-                    card_html += display_card(card['rank'], card['suit'], "small")
-                st.markdown(card_html, unsafe_allow_html=True)
-                
-                # 移除按鈕
-                cols = st.columns(len(cards))
-                for idx, card in enumerate(cards):
-                    with cols[idx]:
-                        if st.button(f"❌", key=f"remove_p2_{hand}_{idx}"):
-                            remove_card(card, f'p2_{hand}')
-                            st.rerun()
+        card_picker_fragment()
     
     with col2:
         st.header("🎯 求解結果")
@@ -325,21 +390,22 @@ def main():
                         game_state = create_game_state()
                         
                         # 調用 API
-                        response = requests.post(
+                        response = get_session().post(
                             f"{API_URL}/api/v1/solve",
-                            json={
+                            data=dumps({
                                 "game_state": game_state,
                                 "options": {
                                     "time_limit": time_limit,
                                     "threads": threads,
                                     "simulations": simulations
                                 }
-                            },
-                            headers={"X-API-Key": API_KEY}
+                            }),
+                            headers={"Content-Type": "application/json"},
+                            timeout=(3, time_limit + 10)
                         )
                         
                         if response.status_code == 200:
-                            result = response.json()
+                            result = loads(response.content)
                             st.session_state['last_result'] = result
                             st.success("✅ 求解完成！")
                         else:
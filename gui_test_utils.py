@@ -2,11 +2,18 @@
 """
 GUI 測試工具函數
 提供 Selenium 測試的輔助功能
+
+driver 的隱式等待為 0：所有元素查找都應透過顯式等待（WebDriverWait）進行，
+隱式等待會疊加在每次顯式等待的輪詢上。確實需要隱式等待的舊代碼可使用
+StreamlitHelper.implicit_wait() 暫時開啟。
 """
 
 import os
 import time
-import json
+import atexit
+import base64
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple
 from selenium import webdriver
@@ -19,42 +26,217 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 
+try:
+    from webdriver_manager.chrome import ChromeDriverManager
+    from webdriver_manager.firefox import GeckoDriverManager
+    WEBDRIVER_MANAGER_AVAILABLE = True
+except ImportError:  # webdriver-manager is optional; fall back to the configured path or PATH
+    WEBDRIVER_MANAGER_AVAILABLE = False
+
+from json_compat import dumps
 from test_gui_config import TestConfig, BrowserType
 
+# 所有 TestRecorder 共用的背景寫入線程池，進程結束時等待寫入完成後關閉
+_WRITE_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+atexit.register(_WRITE_EXECUTOR.shutdown, wait=True)
+
+# 頁面端的輔助函數：在瀏覽器端一次完成查找和操作，避免逐個元素讀取 .text 的往返。
+# Chrome 在創建 driver 時透過 CDP 註冊到每個新頁面；其他瀏覽器在首次調用時注入。
+OFC_HELPERS_JS = """
+window.__ofcHelpers = {
+    texts(els) {
+        return Array.from(els, el => el.innerText.trim()).filter(t => t !== '_');
+    },
+    findByLabel(containerSel, labelSel, text) {
+        for (const el of document.querySelectorAll(containerSel)) {
+            const lab = el.querySelector(labelSel);
+            if (lab && lab.innerText.includes(text)) return el;
+        }
+        return null;
+    },
+    clickByText(selector, text) {
+        const el = Array.from(document.querySelectorAll(selector))
+            .find(el => el.innerText.includes(text));
+        if (!el) return null;
+        el.scrollIntoView(true);
+        el.click();
+        return el;
+    },
+    click(el) {
+        el.click();
+    },
+    scrollIntoView(el) {
+        el.scrollIntoView(true);
+    },
+    scrollAndClick(el) {
+        el.scrollIntoView(true);
+        el.click();
+    },
+    setSlider(container, value) {
+        const slider = container.querySelector("[role='slider']");
+        if (!slider) return false;
+        slider.setAttribute('aria-valuenow', value);
+        slider.dispatchEvent(new Event('change', {bubbles: true}));
+        return true;
+    },
+    metrics(selector) {
+        const out = [];
+        for (const m of document.querySelectorAll(selector)) {
+            const lab = m.querySelector("[data-testid='stMetricLabel']");
+            const val = m.querySelector("[data-testid='stMetricValue']");
+            if (lab && val) out.push([lab.innerText, val.innerText]);
+        }
+        return out;
+    },
+    cards(selector) {
+        return Array.from(document.querySelectorAll(selector))
+            .map(el => [el.innerText.trim(), el]);
+    },
+    snapshotState(hands, cardSel, containerSel) {
+        const out = {};
+        for (const [name, sel] of Object.entries(hands)) {
+            out[name] = this.texts(document.querySelectorAll(sel));
+        }
+        out.tray = this.texts(Array.from(document.querySelectorAll(cardSel))
+            .filter(el => !el.closest(containerSel)));
+        return out;
+    },
+};
+"""
+
+# 調用已註冊的輔助函數；頁面中尚未註冊時返回 [false, null]
+_CALL_HELPER_JS = """
+const h = window.__ofcHelpers;
+if (!h) return [false, null];
+const [name, ...args] = arguments;
+return [true, h[name](...args)];
+"""
+
+def _xpath_literal(text: str) -> str:
+    """將文字轉為 XPath 字串字面量（同時含單引號和雙引號時使用 concat()）"""
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in text.split("'")) + ")"
+
+def call_helper(driver: WebDriver, name: str, *args):
+    """調用頁面中的 window.__ofcHelpers[name]，一次往返且只傳送函數名稱和參數"""
+    registered, result = driver.execute_script(_CALL_HELPER_JS, name, *args)
+    if not registered:
+        driver.execute_script(OFC_HELPERS_JS)
+        registered, result = driver.execute_script(_CALL_HELPER_JS, name, *args)
+    return result
+
+# PerformanceMonitor 一次讀取的瀏覽器性能指標
+_BROWSER_METRICS_JS = """
+const m = arguments[0] ? performance.memory : null;
+return {
+    memory: m ? {
+        jsHeapSizeLimit: m.jsHeapSizeLimit,
+        totalJSHeapSize: m.totalJSHeapSize,
+        usedJSHeapSize: m.usedJSHeapSize
+    } : {},
+    timing: performance.timing.toJSON(),
+    navigation: performance.navigation.toJSON()
+};
+"""
+
 class WebDriverManager:
     """WebDriver 管理器"""
     
+    # 本進程（每個 xdist worker）共用的瀏覽器，避免每個測試類重新啟動瀏覽器
+    _shared: Optional[WebDriver] = None
+    # webdriver-manager 安裝的驅動路徑，每個進程只檢查一次版本
+    _chromedriver_path: Optional[str] = None
+    _geckodriver_path: Optional[str] = None
+    
+    @classmethod
+    def get_or_create_driver(cls, worker_id: Optional[str] = TestConfig.WORKER_ID) -> WebDriver:
+        """返回共用的 WebDriver，首次調用時創建並在進程結束時關閉"""
+        if cls._shared is None:
+            cls._shared = cls.create_driver(worker_id=worker_id)
+            atexit.register(cls.quit_shared)
+        return cls._shared
+    
+    @classmethod
+    def quit_shared(cls):
+        """關閉共用的 WebDriver"""
+        if cls._shared is not None:
+            cls._shared.quit()
+            cls._shared = None
+    
     @staticmethod
-    def create_driver(browser_type: BrowserType = TestConfig.BROWSER) -> WebDriver:
-        """創建 WebDriver 實例"""
+    def reset_driver(driver: WebDriver, url: str = TestConfig.BASE_URL):
+        """清除 cookies 和瀏覽器存儲後重新載入應用，不需重啟瀏覽器"""
+        driver.delete_all_cookies()
+        # about:blank 等頁面不允許存取 storage，忽略該錯誤
+        driver.execute_script(
+            "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+        )
+        driver.get(url)
+    
+    @staticmethod
+    def create_driver(browser_type: BrowserType = TestConfig.BROWSER,
+                      worker_id: Optional[str] = TestConfig.WORKER_ID) -> WebDriver:
+        """創建 WebDriver 實例
+        
+        worker_id 為 pytest-xdist 的 worker 編號，用於隔離各 worker 的瀏覽器設定檔和調試端口
+        """
         if browser_type == BrowserType.CHROME:
-            return WebDriverManager._create_chrome_driver()
+            return WebDriverManager._create_chrome_driver(worker_id)
         elif browser_type == BrowserType.FIREFOX:
             return WebDriverManager._create_firefox_driver()
         else:
             raise ValueError(f"Unsupported browser type: {browser_type}")
     
     @staticmethod
-    def _create_chrome_driver() -> WebDriver:
+    def _worker_index(worker_id: str) -> int:
+        """從 "gw3" 形式的 worker 編號取得序號"""
+        digits = worker_id.lstrip("gw")
+        return int(digits) if digits.isdigit() else 0
+    
+    @staticmethod
+    def _create_remote_driver(options) -> WebDriver:
+        """在 Selenium Grid 上創建遠端 WebDriver"""
+        driver = webdriver.Remote(command_executor=TestConfig.GRID_URL, options=options)
+        driver.implicitly_wait(0)
+        driver.set_page_load_timeout(TestConfig.PAGE_LOAD_TIMEOUT)
+        return driver
+    
+    @staticmethod
+    def _create_chrome_driver(worker_id: Optional[str] = None) -> WebDriver:
         """創建 Chrome WebDriver"""
         from selenium.webdriver.chrome.options import Options
         from selenium.webdriver.chrome.service import Service
         
         options = Options()
         browser_options = TestConfig.get_browser_options(BrowserType.CHROME)
+        arguments = list(browser_options.get("arguments", []))
+        
+        # 並行時每個 worker 使用獨立的設定檔目錄和調試端口，避免互相衝突
+        if worker_id:
+            arguments.append(f"--user-data-dir=/tmp/chrome-{worker_id}")
+            arguments.append(f"--remote-debugging-port={9222 + WebDriverManager._worker_index(worker_id)}")
         
         # 添加參數
-        for arg in browser_options.get("arguments", []):
+        for arg in arguments:
             options.add_argument(arg)
         
         # 添加偏好設置
         for key, value in browser_options.get("prefs", {}).items():
             options.add_experimental_option("prefs", {key: value})
         
+        if TestConfig.GRID_URL:
+            return WebDriverManager._create_remote_driver(options)
+        
         # 創建 driver
-        if WEBDRIVER_MANAGER_AVAILABLE and not TestConfig.CHROME_DRIVER_PATH:
+        if (WEBDRIVER_MANAGER_AVAILABLE and not TestConfig.CHROME_DRIVER_PATH
+                and not TestConfig.SKIP_DRIVER_CHECK):
             # 使用 webdriver-manager 自動管理 ChromeDriver
-            service = Service(ChromeDriverManager().install())
+            if WebDriverManager._chromedriver_path is None:
+                WebDriverManager._chromedriver_path = ChromeDriverManager().install()
+            service = Service(executable_path=WebDriverManager._chromedriver_path)
         else:
             # 使用手動指定的路徑或系統 PATH
             service_args = {}
@@ -63,8 +245,10 @@ class WebDriverManager:
             service = Service(**service_args) if service_args else None
         
         driver = webdriver.Chrome(service=service, options=options)
+        # 預先註冊頁面端輔助函數，之後每次調用只需傳送函數名稱
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': OFC_HELPERS_JS})
         
-        driver.implicitly_wait(TestConfig.IMPLICIT_WAIT)
+        driver.implicitly_wait(0)
         driver.set_page_load_timeout(TestConfig.PAGE_LOAD_TIMEOUT)
         
         return driver
@@ -82,10 +266,16 @@ class WebDriverManager:
         for arg in browser_options.get("arguments", []):
             options.add_argument(arg)
         
+        if TestConfig.GRID_URL:
+            return WebDriverManager._create_remote_driver(options)
+        
         # 創建 driver
-        if WEBDRIVER_MANAGER_AVAILABLE and not TestConfig.FIREFOX_DRIVER_PATH:
+        if (WEBDRIVER_MANAGER_AVAILABLE and not TestConfig.FIREFOX_DRIVER_PATH
+                and not TestConfig.SKIP_DRIVER_CHECK):
             # 使用 webdriver-manager 自動管理 GeckoDriver
-            service = Service(GeckoDriverManager().install())
+            if WebDriverManager._geckodriver_path is None:
+                WebDriverManager._geckodriver_path = GeckoDriverManager().install()
+            service = Service(executable_path=WebDriverManager._geckodriver_path)
         else:
             # 使用手動指定的路徑或系統 PATH
             service_args = {}
@@ -95,7 +285,7 @@ class WebDriverManager:
         
         driver = webdriver.Firefox(service=service, options=options)
         
-        driver.implicitly_wait(TestConfig.IMPLICIT_WAIT)
+        driver.implicitly_wait(0)
         driver.set_page_load_timeout(TestConfig.PAGE_LOAD_TIMEOUT)
         
         return driver
@@ -105,7 +295,70 @@ class StreamlitHelper:
     
     def __init__(self, driver: WebDriver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, TestConfig.DEFAULT_TIMEOUT)
+        # WebDriverWait 以 (超時, 輪詢間隔) 為鍵重用，不在每次等待時重新創建
+        self._waits: Dict[Tuple[float, float], WebDriverWait] = {}
+        self.wait = self._wait_for(TestConfig.DEFAULT_TIMEOUT)
+        # 查找結果快取，以 (查詢鍵, 頁面版本) 為鍵；會改變 DOM 的操作會遞增版本
+        self.page_version = 0
+        self._selector_cache: Dict[Tuple[Any, int], Any] = {}
+    
+    def invalidate(self):
+        """頁面已改變，使快取的查找結果失效"""
+        self.page_version += 1
+        self._selector_cache.clear()
+    
+    def cached(self, key: Any, fetch):
+        """在當前頁面版本內記憶 fetch() 的結果"""
+        cache_key = (key, self.page_version)
+        if cache_key not in self._selector_cache:
+            self._selector_cache[cache_key] = fetch()
+        return self._selector_cache[cache_key]
+    
+    def find_by_label(self, container_selector: str, label: str,
+                      label_selector: str = "label") -> Optional[WebElement]:
+        """找到標籤包含指定文字的容器（一次 execute_script）"""
+        return self.cached(
+            (container_selector, label_selector, label),
+            lambda: call_helper(self.driver, "findByLabel", container_selector, label_selector, label)
+        )
+    
+    @contextmanager
+    def implicit_wait(self, seconds: float = TestConfig.IMPLICIT_WAIT):
+        """暫時開啟隱式等待（供仍依賴它的舊代碼使用），離開時恢復為 0"""
+        self.driver.implicitly_wait(seconds)
+        try:
+            yield
+        finally:
+            self.driver.implicitly_wait(0)
+    
+    def _wait_for(self, timeout: float, poll_frequency: float = 0.5) -> WebDriverWait:
+        """返回快取的 WebDriverWait"""
+        key = (timeout, poll_frequency)
+        wait = self._waits.get(key)
+        if wait is None:
+            wait = self._waits[key] = WebDriverWait(self.driver, timeout, poll_frequency=poll_frequency)
+        return wait
+    
+    def _wait_until(self, condition, timeout: int = TestConfig.ELEMENT_WAIT,
+                    poll_frequency: float = 0.5):
+        """等待條件成立，條件一成立立即返回"""
+        return self._wait_for(timeout, poll_frequency).until(condition)
+    
+    def wait_for_rerun(self, timeout: int = TestConfig.DEFAULT_TIMEOUT,
+                       start_timeout: float = TestConfig.RERUN_START_WAIT):
+        """等待 Streamlit 重新執行完成（變化很快，密集輪詢）
+        
+        點擊後運行狀態指示還沒出現，先短暫等待它出現，再等待它消失；
+        重新執行太快而沒看到指示時，直接等待消失
+        """
+        running = (By.CSS_SELECTOR, TestConfig.STREAMLIT_SELECTORS["running"])
+        try:
+            self._wait_until(EC.presence_of_element_located(running),
+                             start_timeout, poll_frequency=0.05)
+        except TimeoutException:
+            pass
+        self._wait_until(EC.invisibility_of_element_located(running),
+                         timeout, poll_frequency=0.1)
     
     def wait_for_app_loaded(self):
         """等待 Streamlit 應用載入完成"""
@@ -114,134 +367,120 @@ class StreamlitHelper:
                 (By.CSS_SELECTOR, TestConfig.STREAMLIT_SELECTORS["app_loaded"])
             )
         )
-        # 額外等待以確保所有元素載入
-        time.sleep(2)
-    
-    def click_button(self, button_text: str, timeout: int = TestConfig.ELEMENT_WAIT):
-        """點擊包含特定文字的按鈕"""
-        # Streamlit 按鈕可能需要特殊處理
-        buttons = self.wait.until(
-            EC.presence_of_all_elements_located(
-                (By.TAG_NAME, "button")
-            )
+        # 等待首次執行的加載動畫消失
+        self._wait_until(
+            EC.invisibility_of_element_located(
+                (By.CSS_SELECTOR, TestConfig.STREAMLIT_SELECTORS["spinner"])
+            ),
+            TestConfig.DEFAULT_TIMEOUT,
+            poll_frequency=0.1
         )
+    
+    def click_button(self, button_text: str, timeout: int = TestConfig.ELEMENT_WAIT,
+                     post_condition=None):
+        """點擊包含特定文字的按鈕
         
-        for button in buttons:
-            if button_text in button.text:
-                # 滾動到按鈕位置
-                self.driver.execute_script("arguments[0].scrollIntoView(true);", button)
-                time.sleep(0.5)
-                # 使用 JavaScript 點擊以避免元素被遮擋
-                self.driver.execute_script("arguments[0].click();", button)
-                return True
+        點擊後等待 post_condition 成立；未提供時等待 Streamlit 重新執行完成
+        """
+        # 由瀏覽器端的 XPath 比對文字，並等待按鈕可點擊
+        xpath = f"//button[contains(normalize-space(.), {_xpath_literal(button_text)})]"
+        try:
+            button = self._wait_until(EC.element_to_be_clickable((By.XPATH, xpath)), timeout)
+        except TimeoutException:
+            raise NoSuchElementException(f"Button with text '{button_text}' not found")
+        
+        # 滾動並用 JavaScript 點擊（避免元素被遮擋），一次往返
+        call_helper(self.driver, "scrollAndClick", button)
         
-        raise NoSuchElementException(f"Button with text '{button_text}' not found")
+        self.invalidate()
+        if post_condition is not None:
+            self._wait_until(post_condition, timeout)
+        else:
+            self.wait_for_rerun(timeout)
+        # 等待期間讀到的仍可能是舊頁面，重新執行完成後再使快取失效一次
+        self.invalidate()
+        return True
     
     def select_dropdown(self, label: str, value: str):
         """選擇下拉菜單選項"""
         # 找到包含標籤的選擇框
-        select_containers = self.driver.find_elements(
-            By.CSS_SELECTOR, TestConfig.STREAMLIT_SELECTORS["select_box"]
-        )
+        container = self.find_by_label(TestConfig.STREAMLIT_SELECTORS["select_box"], label)
         
-        for container in select_containers:
+        if container is not None:
             try:
-                label_element = container.find_element(By.TAG_NAME, "label")
-                if label in label_element.text:
-                    # 點擊選擇框
-                    select_element = container.find_element(By.TAG_NAME, "div[role='button']")
-                    select_element.click()
-                    time.sleep(0.5)
-                    
-                    # 選擇選項
-                    options = self.driver.find_elements(By.CSS_SELECTOR, "[role='option']")
-                    for option in options:
-                        if value in option.text:
-                            option.click()
-                            return True
-            except:
-                continue
+                # 點擊選擇框
+                select_element = container.find_element(By.CSS_SELECTOR, "div[role='button']")
+                select_element.click()
+                
+                # 等待選項列表出現後再選擇
+                self._wait_until(
+                    EC.visibility_of_element_located((By.CSS_SELECTOR, "[role='option']"))
+                )
+                if call_helper(self.driver, "clickByText", "[role='option']", value):
+                    self.invalidate()
+                    return True
+            except NoSuchElementException:
+                pass
         
         raise NoSuchElementException(f"Dropdown with label '{label}' not found")
     
     def set_slider(self, label: str, value: int):
         """設置滑塊值"""
-        sliders = self.driver.find_elements(
-            By.CSS_SELECTOR, TestConfig.STREAMLIT_SELECTORS["slider"]
-        )
+        slider_container = self.find_by_label(TestConfig.STREAMLIT_SELECTORS["slider"], label)
         
-        for slider_container in sliders:
-            try:
-                label_element = slider_container.find_element(By.TAG_NAME, "label")
-                if label in label_element.text:
-                    # 獲取滑塊元素
-                    slider = slider_container.find_element(By.CSS_SELECTOR, "[role='slider']")
-                    
-                    # 使用 JavaScript 設置值
-                    self.driver.execute_script(
-                        "arguments[0].setAttribute('aria-valuenow', arguments[1]);",
-                        slider, value
-                    )
-                    
-                    # 觸發變更事件
-                    self.driver.execute_script(
-                        "arguments[0].dispatchEvent(new Event('change', {bubbles: true}));",
-                        slider
-                    )
-                    return True
-            except:
-                continue
+        # 使用 JavaScript 設置值並觸發變更事件（同步完成，無需再等待屬性）
+        if slider_container is not None and call_helper(
+            self.driver, "setSlider", slider_container, value
+        ):
+            return True
         
         raise NoSuchElementException(f"Slider with label '{label}' not found")
     
     def toggle_checkbox(self, label: str, checked: bool):
         """切換複選框狀態"""
-        checkboxes = self.driver.find_elements(
-            By.CSS_SELECTOR, TestConfig.STREAMLIT_SELECTORS["checkbox"]
-        )
+        checkbox_container = self.find_by_label(TestConfig.STREAMLIT_SELECTORS["checkbox"], label)
         
-        for checkbox_container in checkboxes:
+        if checkbox_container is not None:
             try:
-                label_element = checkbox_container.find_element(By.TAG_NAME, "label")
-                if label in label_element.text:
-                    checkbox = checkbox_container.find_element(By.TAG_NAME, "input[type='checkbox']")
-                    
-                    # 檢查當前狀態
-                    is_checked = checkbox.is_selected()
-                    if is_checked != checked:
-                        # 使用 JavaScript 點擊
-                        self.driver.execute_script("arguments[0].click();", checkbox)
-                    return True
-            except:
-                continue
+                checkbox = checkbox_container.find_element(By.CSS_SELECTOR, "input[type='checkbox']")
+                
+                # 檢查當前狀態
+                is_checked = checkbox.is_selected()
+                if is_checked != checked:
+                    # 使用 JavaScript 點擊
+                    call_helper(self.driver, "click", checkbox)
+                    self._wait_until(EC.element_selection_state_to_be(checkbox, checked))
+                    self.invalidate()
+                return True
+            except NoSuchElementException:
+                pass
         
         raise NoSuchElementException(f"Checkbox with label '{label}' not found")
     
     def wait_for_spinner_disappear(self, timeout: int = TestConfig.AI_COMPUTATION_TIMEOUT):
-        """等待加載動畫消失"""
+        """等待加載動畫消失（AI 計算較慢，保持預設輪詢間隔）"""
         try:
-            WebDriverWait(self.driver, timeout).until_not(
+            self._wait_for(timeout).until_not(
                 EC.presence_of_element_located(
                     (By.CSS_SELECTOR, TestConfig.STREAMLIT_SELECTORS["spinner"])
                 )
             )
         except TimeoutException:
             pass  # Spinner 可能已經消失
+        self.invalidate()
     
     def get_metric_value(self, label: str) -> str:
         """獲取指標值"""
-        metrics = self.driver.find_elements(
-            By.CSS_SELECTOR, TestConfig.STREAMLIT_SELECTORS["metric"]
+        selector = TestConfig.STREAMLIT_SELECTORS["metric"]
+        # 一次取回所有 (標籤, 值) 對
+        metrics = self.cached(
+            ("metrics", selector),
+            lambda: call_helper(self.driver, "metrics", selector)
         )
         
-        for metric in metrics:
-            try:
-                label_element = metric.find_element(By.CSS_SELECTOR, "[data-testid='stMetricLabel']")
-                if label in label_element.text:
-                    value_element = metric.find_element(By.CSS_SELECTOR, "[data-testid='stMetricValue']")
-                    return value_element.text
-            except:
-                continue
+        for metric_label, value in metrics:
+            if label in metric_label:
+                return value
         
         raise NoSuchElementException(f"Metric with label '{label}' not found")
     
@@ -266,6 +505,17 @@ class GameHelper:
         self.driver = driver
         self.wait = WebDriverWait(driver, TestConfig.DEFAULT_TIMEOUT)
         self.streamlit = StreamlitHelper(driver)
+        # 每墩手牌的容器與卡牌合併為一個後代選擇器，一次查詢即可取得
+        self._hand_selectors = {
+            ht: f"{TestConfig.GAME_SELECTORS[ht + '_hand']} .card" for ht in ("front", "middle", "back")
+        }
+        # 已放入三墩的卡牌
+        self._placed_selector = f"{TestConfig.GAME_SELECTORS['hand_container']} .card"
+    
+    def _count_grows(self, selector: str):
+        """返回等待條件：selector 匹配的元素數量超過點擊前的數量"""
+        before = len(self.get_cards(selector))
+        return lambda d: len(d.find_elements(By.CSS_SELECTOR, selector)) > before
     
     def get_cards(self, selector: str) -> List[WebElement]:
         """獲取卡牌元素"""
@@ -273,8 +523,8 @@ class GameHelper:
     
     def click_card(self, card_element: WebElement):
         """點擊卡牌"""
-        self.driver.execute_script("arguments[0].scrollIntoView(true);", card_element)
-        time.sleep(0.5)
+        call_helper(self.driver, "scrollIntoView", card_element)
+        self.wait.until(EC.element_to_be_clickable(card_element))
         card_element.click()
     
     def get_card_text(self, card_element: WebElement) -> str:
@@ -283,25 +533,34 @@ class GameHelper:
     
     def select_card_by_value(self, card_value: str) -> bool:
         """根據值選擇卡牌"""
-        cards = self.get_cards(TestConfig.GAME_SELECTORS["card"])
-        for card in cards:
-            if card_value in self.get_card_text(card):
+        selector = TestConfig.GAME_SELECTORS["card"]
+        # 卡牌及其文字在下一次放置操作前保持快取
+        cards = self.streamlit.cached(
+            ("cards", selector),
+            lambda: call_helper(self.driver, "cards", selector)
+        )
+        for text, card in cards:
+            if card_value in text:
                 self.click_card(card)
                 return True
         return False
     
+    def snapshot_state(self) -> Dict[str, List[str]]:
+        """一次讀取三墩手牌和牌盤上的卡牌文字（每個頁面版本只讀取一次）"""
+        return self.streamlit.cached(
+            "snapshot",
+            lambda: call_helper(
+                self.driver, "snapshotState",
+                self._hand_selectors, ".card", TestConfig.GAME_SELECTORS["hand_container"]
+            )
+        )
+    
     def get_hand_cards(self, hand_type: str) -> List[str]:
         """獲取特定手牌的卡牌"""
-        selector = TestConfig.GAME_SELECTORS.get(f"{hand_type}_hand")
-        if not selector:
+        if hand_type not in self._hand_selectors:
             raise ValueError(f"Invalid hand type: {hand_type}")
         
-        try:
-            hand_container = self.driver.find_element(By.CSS_SELECTOR, selector)
-            cards = hand_container.find_elements(By.CSS_SELECTOR, ".card")
-            return [self.get_card_text(card) for card in cards if self.get_card_text(card) != "_"]
-        except NoSuchElementException:
-            return []
+        return list(self.snapshot_state()[hand_type])
     
     def place_card(self, card_value: str, position: str):
         """放置卡牌到指定位置"""
@@ -312,45 +571,53 @@ class GameHelper:
         # 選擇位置
         self.streamlit.select_dropdown("放置位置", position)
         
-        # 點擊放置按鈕
-        self.streamlit.click_button("放置牌")
-    
-    def start_new_game(self):
-        """開始新遊戲"""
-        self.streamlit.click_button("新遊戲")
-        time.sleep(1)
-    
-    def deal_initial_cards(self):
-        """發初始牌"""
-        self.streamlit.click_button("發初始5張牌")
-        time.sleep(1)
-    
-    def draw_street(self, street_number: int):
-        """抽街道牌"""
-        self.streamlit.click_button(f"抽第{street_number}街")
-        time.sleep(1)
+        # 點擊放置按鈕，等到三墩中多出一張牌
+        self.streamlit.click_button("放置牌", post_condition=self._count_grows(self._placed_selector))
+    
+    def start_new_game(self, post_condition=None):
+        """開始新遊戲（預設等到牌面清空）"""
+        if post_condition is None:
+            card_selector = TestConfig.GAME_SELECTORS["card"]
+            post_condition = lambda d: not d.find_elements(By.CSS_SELECTOR, card_selector)
+        self.streamlit.click_button("新遊戲", post_condition=post_condition)
+    
+    def deal_initial_cards(self, post_condition=None):
+        """發初始牌（預設等到牌面上出現5張牌）"""
+        if post_condition is None:
+            card_selector = TestConfig.GAME_SELECTORS["card"]
+            post_condition = lambda d: len(d.find_elements(By.CSS_SELECTOR, card_selector)) >= 5
+        self.streamlit.click_button("發初始5張牌", post_condition=post_condition)
+    
+    def draw_street(self, street_number: int, post_condition=None):
+        """抽街道牌（預設等到牌面上多出新抽的牌）"""
+        if post_condition is None:
+            post_condition = self._count_grows(TestConfig.GAME_SELECTORS["card"])
+        self.streamlit.click_button(f"抽第{street_number}街", post_condition=post_condition)
     
     def get_ai_suggestion(self):
-        """獲取 AI 建議"""
-        self.streamlit.click_button("獲取 AI 建議")
+        """獲取 AI 建議（等到「採用 AI 建議」按鈕出現）"""
+        apply_xpath = f"//button[contains(normalize-space(.), {_xpath_literal('採用 AI 建議')})]"
+        self.streamlit.click_button(
+            "獲取 AI 建議", timeout=TestConfig.AI_COMPUTATION_TIMEOUT,
+            post_condition=EC.presence_of_element_located((By.XPATH, apply_xpath))
+        )
         self.streamlit.wait_for_spinner_disappear()
     
-    def apply_ai_suggestion(self):
-        """應用 AI 建議"""
-        self.streamlit.click_button("採用 AI 建議")
-        time.sleep(1)
+    def apply_ai_suggestion(self, post_condition=None):
+        """應用 AI 建議（預設等到三墩中多出放置的牌）"""
+        if post_condition is None:
+            post_condition = self._count_grows(self._placed_selector)
+        self.streamlit.click_button("採用 AI 建議", post_condition=post_condition)
     
     def save_game(self) -> str:
         """保存遊戲並返回下載鏈接"""
-        self.streamlit.click_button("保存遊戲")
-        time.sleep(1)
+        # 點擊後等到下載按鈕出現
+        download_locator = (By.CSS_SELECTOR, TestConfig.STREAMLIT_SELECTORS["download_button"])
+        self.streamlit.click_button("保存遊戲",
+                                    post_condition=EC.presence_of_element_located(download_locator))
         
         # 獲取下載按鈕
-        download_button = self.wait.until(
-            EC.presence_of_element_located(
-                (By.CSS_SELECTOR, TestConfig.STREAMLIT_SELECTORS["download_button"])
-            )
-        )
+        download_button = self.driver.find_element(*download_locator)
         
         # 獲取下載鏈接
         return download_button.get_attribute("href")
@@ -362,59 +629,96 @@ class TestRecorder:
         self.test_name = test_name
         self.start_time = None
         self.events = []
+        # 事件只記錄單調時鐘偏移（納秒），牆鐘時間在保存報告時才換算
+        self._t0_wall = time.time()
+        self._t0_mono = time.monotonic_ns()
+        # 截圖和報告的磁碟寫入在共用的背景線程池完成，不計入測試操作時間
+        self._pending = []
     
     def start(self):
         """開始記錄"""
-        self.start_time = time.time()
+        self.start_time = self._t0_wall = time.time()
+        self._t0_mono = time.monotonic_ns()
         self.log_event("Test started", {"test_name": self.test_name})
     
     def log_event(self, event_type: str, data: Dict[str, Any] = None):
         """記錄事件"""
-        event = {
-            "timestamp": datetime.now().isoformat(),
-            "elapsed_time": time.time() - self.start_time if self.start_time else 0,
-            "event_type": event_type,
-            "data": data or {}
-        }
-        self.events.append(event)
+        self.events.append((time.monotonic_ns() - self._t0_mono, event_type, data or {}))
     
     def take_screenshot(self, driver: WebDriver, name: str = None):
-        """截圖"""
+        """截圖（在背景寫入；讀取檔案前須先調用 flush()）"""
         TestConfig.ensure_directories()
         
         filename = f"{self.test_name}_{name or 'screenshot'}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
         filepath = os.path.join(TestConfig.SCREENSHOT_DIR, filename)
         
-        driver.save_screenshot(filepath)
+        # 只在測試線程上向瀏覽器取圖，解碼和寫檔交給背景線程
+        png_base64 = driver.get_screenshot_as_base64()
+        self._pending.append(_WRITE_EXECUTOR.submit(_write_screenshot, filepath, png_base64))
         self.log_event("screenshot_taken", {"filepath": filepath})
         
         return filepath
     
-    def save_report(self):
-        """保存測試報告"""
+    def flush(self):
+        """等待本記錄器的所有背景寫入完成，並拋出寫入時發生的錯誤"""
+        pending, self._pending = self._pending, []
+        for future in wait(pending).done:
+            future.result()
+    
+    def save_report(self, pretty: bool = False):
+        """保存測試報告（在背景寫入；需要縮排格式時傳入 pretty=True）
+        
+        返回的路徑在調用 flush() 之前可能尚未寫入。
+        """
         TestConfig.ensure_directories()
         
         report = {
             "test_name": self.test_name,
             "start_time": self.start_time,
             "duration": time.time() - self.start_time if self.start_time else 0,
-            "events": self.events
+            "events": [
+                {
+                    "timestamp": _iso_at(self._t0_wall, mono_ns),
+                    "elapsed_time": mono_ns / 1e9 if self.start_time else 0,
+                    "event_type": event_type,
+                    "data": data
+                }
+                for mono_ns, event_type, data in self.events
+            ]
         }
         
         filename = f"{self.test_name}_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         filepath = os.path.join(TestConfig.TEST_DATA_DIR, filename)
         
-        with open(filepath, 'w') as f:
-            json.dump(report, f, indent=2)
+        self._pending.append(_WRITE_EXECUTOR.submit(_write_report, filepath, report, pretty))
         
         return filepath
 
+def _iso_at(t0_wall: float, offset_ns: int) -> str:
+    """起點牆鐘時間加上單調時鐘偏移，轉為 ISO 格式時間戳"""
+    return datetime.fromtimestamp(t0_wall + offset_ns / 1e9).isoformat()
+
+def _write_screenshot(filepath: str, png_base64: str):
+    """解碼並寫入截圖"""
+    with open(filepath, 'wb') as f:
+        f.write(base64.b64decode(png_base64))
+
+def _write_report(filepath: str, report: Dict[str, Any], pretty: bool):
+    """序列化並以單次寫入保存報告"""
+    with open(filepath, 'wb') as f:
+        f.write(dumps(report, indent=pretty))
+
 class PerformanceMonitor:
     """性能監控器"""
     
     def __init__(self, driver: WebDriver):
         self.driver = driver
         self.metrics = []
+        self._t0_wall = time.time()
+        self._t0_ns = time.perf_counter_ns()
+        # performance.memory 只有 Chrome 支持
+        self._supports_memory = driver.name == "chrome"
+        self._browser_metrics = None
     
     def measure_page_load(self) -> Dict[str, float]:
         """測量頁面加載時間"""
@@ -427,14 +731,15 @@ class PerformanceMonitor:
     
     def measure_action(self, action_name: str, action_func):
         """測量操作執行時間"""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         result = action_func()
-        end_time = time.time()
+        end_ns = time.perf_counter_ns()
         
+        # 時間戳在 generate_report 時才由 end_ns 換算
         metric = {
             "action": action_name,
-            "duration": end_time - start_time,
-            "timestamp": datetime.now().isoformat()
+            "duration": (end_ns - start_ns) / 1e9,
+            "end_ns": end_ns - self._t0_ns
         }
         
         self.metrics.append(metric)
@@ -442,17 +747,18 @@ class PerformanceMonitor:
     
     def get_browser_metrics(self) -> Dict[str, Any]:
         """獲取瀏覽器性能指標"""
-        return {
-            "memory": self.driver.execute_script("return performance.memory") if self.driver.name == "chrome" else {},
-            "timing": self.driver.execute_script("return performance.timing"),
-            "navigation": self.driver.execute_script("return performance.navigation")
-        }
+        # 一次往返取回所有指標
+        return self.driver.execute_script(_BROWSER_METRICS_JS, self._supports_memory)
     
     def generate_report(self) -> Dict[str, Any]:
-        """生成性能報告"""
+        """生成性能報告（瀏覽器指標只在首次生成時讀取）"""
+        if self._browser_metrics is None:
+            self._browser_metrics = self.get_browser_metrics()
         return {
-            "metrics": self.metrics,
-            "browser_metrics": self.get_browser_metrics(),
+            "metrics": [
+                {**m, "timestamp": _iso_at(self._t0_wall, m["end_ns"])} for m in self.metrics
+            ],
+            "browser_metrics": self._browser_metrics,
             "summary": {
                 "total_actions": len(self.metrics),
                 "average_duration": sum(m["duration"] for m in self.metrics) / len(self.metrics) if self.metrics else 0,
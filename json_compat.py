@@ -0,0 +1,27 @@
+"""
+JSON 序列化輔助函數：安裝了 orjson 時使用 orjson，否則使用標準庫 json
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """序列化為 JSON bytes（indent 為真時縮排兩格，否則緊湊輸出）"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def loads(raw: bytes) -> Any:
+    """解析 JSON bytes 或字串"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
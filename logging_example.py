@@ -7,7 +7,9 @@ OFC Solver 結構化日誌系統使用示例
 import sys
 import os
 import asyncio
+import functools
 from datetime import datetime
+from itertools import islice
 
 # 添加 src 到 Python 路徑
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -19,13 +21,25 @@ from src import (
 )
 
 
+@functools.lru_cache(maxsize=None)
+def _solve_with_timing():
+    """以性能日誌包裝的求解函數（首次請求時包裝一次，之後重用）
+    
+    延遲到首次調用才取得日誌器，讓 main() 設置的日誌環境變量生效
+    """
+    @get_performance_logger("api").log_timing("api_solve_request")
+    def solve_with_timing(solver: OFCSolver, game_state: GameState):
+        return solver.solve(game_state)
+    
+    return solve_with_timing
+
+
 # 模擬 API 處理函數
 async def handle_solve_request(request_data: dict) -> dict:
     """處理求解請求（模擬 API 端點）"""
     
     # 獲取 API 日誌器
     api_logger = get_api_logger()
-    perf_logger = get_performance_logger("api")
     
     # 創建請求上下文
     request_id = request_data.get('request_id', 'unknown')
@@ -77,14 +91,9 @@ async def handle_solve_request(request_data: dict) -> dict:
                 time_limit=request_data.get('time_limit', 30.0)
             )
             
-            # 使用性能日誌包裝求解過程
-            @perf_logger.log_timing("api_solve_request")
-            async def solve_with_timing():
-                # 模擬異步操作
-                await asyncio.sleep(0.1)
-                return solver.solve(game_state)
-            
-            result = await solve_with_timing()
+            # 求解是 CPU 密集操作，在線程池中執行以免阻塞事件循環
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, _solve_with_timing(), solver, game_state)
             
             # 構建響應
             response = {
@@ -96,7 +105,7 @@ async def handle_solve_request(request_data: dict) -> dict:
                     'confidence': result.confidence,
                     'simulations': result.simulations,
                     'time_taken': result.time_taken,
-                    'top_actions': result.top_actions[:3]  # 只返回前3個
+                    'top_actions': list(islice(result.top_actions, 3))  # 只返回前3個
                 },
                 'timestamp': datetime.utcnow().isoformat() + 'Z'
             }
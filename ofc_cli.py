@@ -4,7 +4,14 @@ OFC Solver 命令行介面（支持鬼牌）
 """
 
 import argparse
-from ofc_solver_joker import PineappleOFCSolverJoker, Card
+from typing import Iterable, List
+from ofc_solver_joker import PineappleOFCSolverJoker, PineappleStateJoker, Card
+
+
+def solve_many(hands: Iterable[List[Card]], simulations: int = 1000) -> List[PineappleStateJoker]:
+    """用同一個求解器依序求解多手初始五張牌（牌可用 Card.from_strings 轉換）"""
+    solver = PineappleOFCSolverJoker(num_simulations=simulations)
+    return [solver.solve_initial_five(cards) for cards in hands]
 
 
 def main():
@@ -17,13 +24,10 @@ def main():
     
     args = parser.parse_args()
     
-    # 創建求解器（支持鬼牌）
-    solver = PineappleOFCSolverJoker(num_simulations=args.simulations)
-    
     # 轉換牌
     try:
-        cards = [Card.from_string(c) for c in args.cards]
-    except Exception as e:
+        cards = Card.from_strings(args.cards)
+    except ValueError as e:
         print(f"錯誤: 無效的牌格式 - {e}")
         print("牌的格式應為: 等級(2-9,T,J,Q,K,A,X) + 花色(s,h,d,c,j)")
         print("例如: As = 黑桃A, Kh = 紅心K, Xj = 鬼牌")
@@ -34,8 +38,8 @@ def main():
         print(f"使用 {args.simulations} 次 MCTS 模擬")
         print("-" * 40)
     
-    # 求解
-    arrangement = solver.solve_initial_five(cards)
+    # 求解（支持鬼牌）
+    arrangement = solve_many([cards], args.simulations)[0]
     
     # 輸出結果
     print("\n最佳擺放:")
@@ -6,12 +6,25 @@ OFC 互動式命令行介面（支持逐街模擬）
 import argparse
 import json
 import os
+import random
+from collections import Counter
 from typing import List, Dict, Any, Optional, Tuple
 from ofc_solver_street import (
     StreetByStreetSolver, StreetState, PineappleState, 
-    Card, Street, OpponentTracker
+    Card, Street, OpponentTracker, create_full_deck
 )
 
+# 每張牌只建立一個 Card 實例，解析輸入時直接查表（鬼牌也在表中）
+_CARD_CACHE = {str(card): card for card in create_full_deck(include_jokers=True)}
+
+
+def _parse_card(card_str: str) -> Card:
+    """解析牌字串，表中沒有的字串才交給 Card.from_string"""
+    card = _CARD_CACHE.get(card_str)
+    if card is None:
+        card = Card.from_string(card_str)
+    return card
+
 
 class InteractiveOFCSession:
     """互動式 OFC 遊戲會話"""
@@ -22,7 +35,8 @@ class InteractiveOFCSession:
         self.game_state = PineappleState()
         self.current_street = Street.INITIAL
         self.history = []
-        self.deck_remaining = []
+        # 剩餘牌組以 Card -> 張數 保存（兩張鬼牌相等，所以用多重集合而不是 set）
+        self.deck_remaining: Counter = Counter()
         
     def start_new_game(self, initial_cards: List[Card]):
         """開始新遊戲"""
@@ -32,10 +46,10 @@ class InteractiveOFCSession:
         self.history = []
         
         # 初始化剩餘牌組
-        full_deck = self.solver.deck.copy()
+        self.deck_remaining = Counter(self.solver.deck)
         for card in initial_cards:
-            full_deck.remove(card)
-        self.deck_remaining = full_deck
+            if not self._take_from_deck(card):
+                raise ValueError(f"{card} 不在牌組中")
         
         # 求解初始5張
         result = self.solver.solve_initial_five(initial_cards)
@@ -65,18 +79,15 @@ class InteractiveOFCSession:
         
         # 如果沒有提供牌，從剩餘牌組隨機抽取
         if drawn_cards is None:
-            import random
-            if len(self.deck_remaining) < 3:
+            remaining = list(self.deck_remaining.elements())
+            if len(remaining) < 3:
                 print("牌組不足！")
                 return None
-            random.shuffle(self.deck_remaining)
-            drawn_cards = self.deck_remaining[:3]
-            self.deck_remaining = self.deck_remaining[3:]
-        else:
-            # 從牌組中移除提供的牌
-            for card in drawn_cards:
-                if card in self.deck_remaining:
-                    self.deck_remaining.remove(card)
+            drawn_cards = random.sample(remaining, 3)
+            
+        # 從牌組中移除抽到的牌
+        for card in drawn_cards:
+            self._take_from_deck(card)
         
         print(f"\n=== 第 {self.current_street.value} 街 ===")
         print(f"抽到: {' '.join(str(c) for c in drawn_cards)}")
@@ -109,6 +120,15 @@ class InteractiveOFCSession:
         
         return result
     
+    def _take_from_deck(self, card: Card) -> bool:
+        """從剩餘牌組中移除一張牌，牌不在牌組中時返回 False"""
+        count = self.deck_remaining.get(card, 0)
+        if count > 1:
+            self.deck_remaining[card] = count - 1
+        elif count:
+            del self.deck_remaining[card]
+        return count > 0
+    
     def _print_current_state(self):
         """打印當前狀態"""
         print(f"前墩 ({len(self.game_state.front_hand.cards)}/3): {' '.join(str(c) for c in self.game_state.front_hand.cards)}")
@@ -147,7 +167,7 @@ class InteractiveOFCSession:
             'current_street': self.current_street.name,
             'game_state': self._serialize_state(self.game_state),
             'history': self.history,
-            'deck_remaining': [str(c) for c in self.deck_remaining]
+            'deck_remaining': sorted(str(c) for c in self.deck_remaining.elements())
         }
         
         with open(filename, 'w') as f:
@@ -161,7 +181,7 @@ class InteractiveOFCSession:
             
         self.current_street = Street[save_data['current_street']]
         self.history = save_data['history']
-        self.deck_remaining = [Card.from_string(c) for c in save_data['deck_remaining']]
+        self.deck_remaining = Counter(_parse_card(c) for c in save_data['deck_remaining'])
         
         # 重建遊戲狀態
         state_data = save_data['game_state']
@@ -169,12 +189,12 @@ class InteractiveOFCSession:
         
         # 恢復手牌
         for pos in ['front', 'middle', 'back']:
-            cards = [Card.from_string(c) for c in state_data[pos]]
+            cards = [_parse_card(c) for c in state_data[pos]]
             for card in cards:
                 self.game_state.place_card(card, pos)
                 
         # 恢復棄牌
-        self.game_state.discarded = [Card.from_string(c) for c in state_data['discarded']]
+        self.game_state.discarded = [_parse_card(c) for c in state_data['discarded']]
         
         print(f"遊戲已載入: {filename}")
         self._print_current_state()
@@ -231,13 +251,13 @@ def interactive_mode():
                 
             elif cmd == 'new' and len(command) == 6:
                 # 開始新遊戲
-                cards = [Card.from_string(c) for c in command[1:6]]
+                cards = [_parse_card(c) for c in command[1:6]]
                 session.start_new_game(cards)
                 
             elif cmd == 'next':
                 # 模擬下一街
                 if len(command) == 4:
-                    cards = [Card.from_string(c) for c in command[1:4]]
+                    cards = [_parse_card(c) for c in command[1:4]]
                     session.simulate_next_street(cards)
                 else:
                     session.simulate_next_street()
@@ -285,7 +305,7 @@ def main():
             include_jokers=not args.no_jokers
         )
         
-        cards = [Card.from_string(c) for c in args.cards]
+        cards = [_parse_card(c) for c in args.cards]
         session.start_new_game(cards)
         
         # 自動模擬所有街道
@@ -6,25 +6,85 @@ OFC 逐街命令行介面（支持連續模擬）
 
 import argparse
 import json
+import multiprocessing
 import os
 import random
-from typing import List, Dict, Any, Optional, Set
-from ofc_solver_joker import PineappleOFCSolverJoker, Card, PineappleStateJoker as PineappleState
+from itertools import chain
+from typing import List, Dict, Any, Optional, Set, Tuple, Iterable, Iterator
+from ofc_solver_joker import (
+    PineappleOFCSolverJoker, Card, PineappleStateJoker as PineappleState,
+    create_full_deck, rank_by_mask, fantasy_by_mask
+)
+
+# 墩位名稱及容量
+POSITIONS = ('front', 'middle', 'back')
+HAND_CAPACITY = (3, 5, 5)
+POSITION_INDEX = {name: i for i, name in enumerate(POSITIONS)}
+# 3張街道牌中 (擺放, 擺放, 棄牌) 的索引，順序同 itertools.combinations(cards, 2)
+_PLACE_PLACE_DISCARD = ((0, 1, 2), (0, 2, 1), (1, 2, 0))
+# 評分時各墩的權重
+FRONT_WEIGHT, MIDDLE_WEIGHT, BACK_WEIGHT = 1.5, 1.2, 1.0
+
+
+def _iter_bits(mask: int) -> Iterator[int]:
+    """由低到高逐一取出遮罩中的單一位元"""
+    while mask:
+        bit = mask & -mask
+        yield bit
+        mask ^= bit
+
+
+def _popcount(mask: int) -> int:
+    """遮罩中的牌數（int.bit_count 需要 Python 3.10）"""
+    return bin(mask).count('1')
+
+
+# 每張牌只建立一個 Card 實例，解析輸入時直接查表（鬼牌也在表中）
+_CARD_CACHE = {str(card): card for card in create_full_deck(include_jokers=True)}
+
+
+def _parse_card(card_str: str) -> Card:
+    """解析牌字串，表中沒有的字串才交給 Card.from_string"""
+    card = _CARD_CACHE.get(card_str)
+    if card is None:
+        card = Card.from_string(card_str)
+    return card
 
 
 class StreetByStreetCLI:
     """逐街命令行介面"""
     
-    def __init__(self, num_simulations: int = 1000000):
-        self.solver = PineappleOFCSolverJoker(num_simulations=num_simulations)
+    # 置換表：相同的已擺牌面加上相同順序的3張牌，最佳動作也相同。
+    # 所有實例共用（GUI 每次請求建議都會建立新的 CLI）
+    TT_MAX_SIZE = 1 << 16
+    _tt: Dict[Tuple[int, ...], Tuple[Optional[int], float]] = {}
+    
+    def __init__(self, num_simulations: int = 1000000, num_workers: int = 1):
+        # 進程池只建立一次，整個遊戲中重用，把 MCTS 模擬分到多個核心
+        self._pool = multiprocessing.Pool(num_workers) if num_workers > 1 else None
+        self.solver = PineappleOFCSolverJoker(num_simulations=num_simulations,
+                                              pool=self._pool, num_workers=num_workers)
         self.game_state = None
-        self.used_cards = set()  # 已使用的牌（包括玩家的牌）
-        self.opponent_cards = set()  # 對手的牌
-        self.discarded_cards = set()  # 棄掉的牌
+        # 牌的追蹤都以 Card.mask 的位元遮罩表示，每張牌一個位元
+        self._used_mask = 0  # 已使用的牌（包括玩家的牌）
+        self._opp_mask = 0  # 對手的牌
+        self._disc_mask = 0  # 棄掉的牌
         self.street_number = 0
         self.history = []
-        self.deck = self._create_full_deck()  # 完整牌組
+        # 位元 -> Card 對照表涵蓋所有可解析的牌（包括鬼牌），牌組本身不含鬼牌
+        self._card_by_bit = {card.mask: card for card in _CARD_CACHE.values()}
+        self._deck_mask = sum(card.mask for card in self._create_full_deck())  # 完整牌組
         self.auto_deal = True  # 默認自動發牌
+        # 最近一次套用動作後三墩的牌型等級（前、中、後），供最終結果直接使用
+        self._last_eval: Optional[Tuple[int, int, int]] = None
+        
+    def close(self):
+        """關閉進程池"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self.solver.pool = None
         
     def solve_initial(self, cards: List[Card]):
         """求解初始5張牌"""
@@ -37,7 +97,7 @@ class StreetByStreetCLI:
         
         # 記錄已使用的牌
         for card in cards:
-            self.used_cards.add(str(card))
+            self.mark_used(card)
             self._remove_from_deck(card)
             
         # 顯示結果
@@ -79,40 +139,22 @@ class StreetByStreetCLI:
             print("遊戲已完成！")
             return None
             
-        # 建立新的求解器來處理當前狀態
-        # 使用 MCTS 來評估所有可能的擺放和棄牌組合
-        best_score = float('-inf')
-        best_action = None
-        
         # 生成所有可能的動作（2張擺放，1張棄牌）
         actions = self._generate_possible_actions(drawn_cards)
         
         print(f"評估 {len(actions)} 種可能的動作...")
         
-        for i, (placements, discard) in enumerate(actions):
-            if i % 10 == 0:
-                print(f"進度: {i}/{len(actions)}")
-                
-            # 創建臨時狀態
-            temp_state = self._copy_state(self.game_state)
-            
-            # 應用動作
-            valid = True
-            for card, position in placements:
-                if not self._can_place_card(temp_state, position):
-                    valid = False
-                    break
-                self._place_card_in_state(temp_state, card, position)
-                
-            if not valid or not temp_state.is_valid():
-                continue
-                
-            # 評估狀態
-            score = self._evaluate_state(temp_state)
-            
-            if score > best_score:
-                best_score = score
-                best_action = (placements, discard)
+        # 評估所有擺放和棄牌組合，只有最佳動作會套用到狀態上
+        key = (self.game_state.front_hand.mask(), self.game_state.middle_hand.mask(),
+               self.game_state.back_hand.mask(), *(c.mask for c in drawn_cards))
+        result = self._tt.get(key)
+        if result is None:
+            result = self._score_actions(actions)
+            if len(self._tt) >= self.TT_MAX_SIZE:
+                self._tt.clear()
+            self._tt[key] = result
+        best_index, best_score = result
+        best_action = actions[best_index] if best_index is not None else None
                 
         if best_action:
             placements, discard = best_action
@@ -120,13 +162,18 @@ class StreetByStreetCLI:
             # 應用最佳動作
             for card, position in placements:
                 self._place_card_in_state(self.game_state, card, position)
-                self.used_cards.add(str(card))
+                self.mark_used(card)
                 self._remove_from_deck(card)
                 
-            self.used_cards.add(str(discard))
-            self.discarded_cards.add(str(discard))
+            self.mark_used(discard)
+            self.mark_discarded(discard)
             self._remove_from_deck(discard)
             
+            # 這些牌面在評分時已經查過表，記下結果而不是完成時重新評估
+            self._last_eval = (self.game_state.front_hand.rank(),
+                               self.game_state.middle_hand.rank(),
+                               self.game_state.back_hand.rank())
+            
             print(f"\n最佳動作:")
             for card, position in placements:
                 print(f"  {card} → {position}")
@@ -170,50 +217,21 @@ class StreetByStreetCLI:
         
     def _generate_possible_actions(self, cards: List[Card]):
         """生成所有可能的動作（選2張擺放，1張棄牌）"""
-        actions = []
-        positions = []
-        
-        # 檢查可用位置
-        if len(self.game_state.front_hand.cards) < 3:
-            positions.append('front')
-        if len(self.game_state.middle_hand.cards) < 5:
-            positions.append('middle')
-        if len(self.game_state.back_hand.cards) < 5:
-            positions.append('back')
-            
-        # 生成所有可能的牌和位置組合
-        from itertools import combinations, permutations
+        state = self.game_state
+        # 各墩目前的牌數，按 POSITIONS 順序，原地增減而不是每次重建
+        counts = [len(state.front_hand.cards), len(state.middle_hand.cards), len(state.back_hand.cards)]
+        open_positions = [p for p in range(3) if counts[p] < HAND_CAPACITY[p]]
         
-        # 選擇2張牌來擺放
-        for two_cards in combinations(cards, 2):
-            discard = [c for c in cards if c not in two_cards][0]
-            
-            # 生成所有可能的位置組合（包括相同位置）
-            for pos_combo in [(p1, p2) for p1 in positions for p2 in positions]:
-                # 檢查位置是否有空間
-                temp_counts = {
-                    'front': len(self.game_state.front_hand.cards),
-                    'middle': len(self.game_state.middle_hand.cards),
-                    'back': len(self.game_state.back_hand.cards)
-                }
-                
-                # 計算每個位置需要的空間
-                pos1, pos2 = pos_combo
-                temp_counts[pos1] += 1
-                if pos1 == pos2:
-                    temp_counts[pos2] += 1
-                else:
-                    temp_counts[pos2] += 1
-                    
-                # 檢查是否超出限制
-                if (temp_counts['front'] > 3 or 
-                    temp_counts['middle'] > 5 or 
-                    temp_counts['back'] > 5):
-                    continue
-                    
-                # 生成擺放組合
-                placements = list(zip(two_cards, pos_combo))
-                actions.append((placements, discard))
+        actions = []
+        # 選擇2張牌來擺放（第三張棄掉），再生成所有有空間的位置組合（包括相同位置）
+        for i, j, k in _PLACE_PLACE_DISCARD:
+            first, second, discard = cards[i], cards[j], cards[k]
+            for p1 in open_positions:
+                counts[p1] += 1
+                for p2 in open_positions:
+                    if counts[p2] < HAND_CAPACITY[p2]:
+                        actions.append(([(first, POSITIONS[p1]), (second, POSITIONS[p2])], discard))
+                counts[p1] -= 1
                 
         return actions
         
@@ -236,36 +254,70 @@ class StreetByStreetCLI:
         elif position == 'back':
             state.back_hand.cards.append(card)
             
-    def _copy_state(self, state: PineappleState) -> PineappleState:
-        """複製遊戲狀態"""
-        new_state = PineappleState()
-        new_state.front_hand.cards = state.front_hand.cards.copy()
-        new_state.middle_hand.cards = state.middle_hand.cards.copy()
-        new_state.back_hand.cards = state.back_hand.cards.copy()
-        return new_state
+    def _score_actions(self, actions) -> Tuple[Optional[int], float]:
+        """評估所有動作，返回 (最佳動作索引, 分數)；沒有有效動作時索引為 None
         
-    def _evaluate_state(self, state: PineappleState) -> float:
-        """評估狀態的分數"""
-        if not state.is_valid():
-            return float('-inf')
+        不建立臨時狀態：每個動作只在三墩的位元遮罩上加上擺放的牌再查表
+        """
+        hands = (self.game_state.front_hand.cards,
+                 self.game_state.middle_hand.cards,
+                 self.game_state.back_hand.cards)
+        base_masks = [sum(c.mask for c in cards) for cards in hands]
+        best_index, best_score = None, float('-inf')
+        
+        for i, (placements, discard) in enumerate(actions):
+            if i % 10 == 0:
+                print(f"進度: {i}/{len(actions)}")
             
-        # 直接評估各手牌
-        front_rank, _ = state.front_hand.evaluate()
-        middle_rank, _ = state.middle_hand.evaluate()
-        back_rank, _ = state.back_hand.evaluate()
+            masks = base_masks.copy()
+            added = ([], [], [])
+            for card, position in placements:
+                p = POSITION_INDEX[position]
+                masks[p] += card.mask
+                added[p].append(card)
+            
+            # 檢查是否超出容量
+            counts = [len(hands[p]) + len(added[p]) for p in range(3)]
+            if any(counts[p] > HAND_CAPACITY[p] for p in range(3)):
+                continue
+            
+            score = self._score_masks(masks, [(hands[p], added[p]) for p in range(3)],
+                                      counts == list(HAND_CAPACITY))
+            if score > best_score:
+                best_index, best_score = i, score
+                
+        return best_index, best_score
+        
+    def _score_masks(self, masks: List[int], parts, complete: bool) -> float:
+        """由三墩的位元遮罩計算分數
+        
+        牌型等級和夢幻樂園與求解器的 MCTS 模擬共用同一張以遮罩為鍵的表，
+        parts 是各墩的牌列表，僅在查表未命中時才組成手牌評估
+        """
+        front_rank = rank_by_mask(masks[0], chain.from_iterable(parts[0]))
+        middle_rank = rank_by_mask(masks[1], chain.from_iterable(parts[1]))
+        back_rank = rank_by_mask(masks[2], chain.from_iterable(parts[2]))
+        
+        # 完整擺放時後墩 >= 中墩 >= 前墩，否則犯規
+        if complete and not back_rank >= middle_rank >= front_rank:
+            return float('-inf')
         
-        # 計算基礎分數
-        score = 0
-        score += front_rank * 1.5  # 前墩加權
-        score += middle_rank * 1.2  # 中墩加權
-        score += back_rank * 1.0   # 後墩
+        # 計算基礎分數（前墩、中墩加權）
+        score = front_rank * FRONT_WEIGHT + middle_rank * MIDDLE_WEIGHT + back_rank * BACK_WEIGHT
         
         # 夢幻樂園加分
-        if state.has_fantasy_land():
+        if fantasy_by_mask(masks[0], chain.from_iterable(parts[0])):
             score += 1000
             
         return score
         
+    def _evaluate_state(self, state: PineappleState) -> float:
+        """評估狀態的分數"""
+        hands = (state.front_hand, state.middle_hand, state.back_hand)
+        return self._score_masks([hand.mask() for hand in hands],
+                                 [(hand.cards,) for hand in hands],
+                                 state.is_complete())
+        
     def _print_final_result(self):
         """打印最終結果"""
         print("\n=== 最終結果 ===")
@@ -275,9 +327,7 @@ class StreetByStreetCLI:
             "同花", "葫蘆", "四條", "同花順", "皇家同花順"
         ]
         
-        front_rank, _ = self.game_state.front_hand.evaluate()
-        middle_rank, _ = self.game_state.middle_hand.evaluate()
-        back_rank, _ = self.game_state.back_hand.evaluate()
+        front_rank, middle_rank, back_rank = self._last_eval
         
         print(f"\n前墩: {' '.join(str(c) for c in self.game_state.front_hand.cards)}")
         print(f"  {rank_names[min(front_rank, 9)]}")
@@ -321,24 +371,70 @@ class StreetByStreetCLI:
         
         return deck
     
+    @property
+    def used_cards(self) -> Set[str]:
+        """已使用的牌（包括玩家的牌）"""
+        return self._mask_to_strs(self._used_mask)
+    
+    @used_cards.setter
+    def used_cards(self, card_strs: Iterable[str]):
+        self._used_mask = self._strs_to_mask(card_strs)
+    
+    @property
+    def opponent_cards(self) -> Set[str]:
+        """對手的牌"""
+        return self._mask_to_strs(self._opp_mask)
+    
+    @opponent_cards.setter
+    def opponent_cards(self, card_strs: Iterable[str]):
+        self._opp_mask = self._strs_to_mask(card_strs)
+    
+    @property
+    def discarded_cards(self) -> Set[str]:
+        """棄掉的牌"""
+        return self._mask_to_strs(self._disc_mask)
+    
+    @discarded_cards.setter
+    def discarded_cards(self, card_strs: Iterable[str]):
+        self._disc_mask = self._strs_to_mask(card_strs)
+    
+    @property
+    def deck(self) -> List[Card]:
+        """牌組中尚未移除的牌"""
+        return [self._card_by_bit[bit] for bit in _iter_bits(self._deck_mask)]
+    
+    def mark_used(self, card: Card):
+        """記錄已使用的牌"""
+        self._used_mask |= card.mask
+    
+    def mark_opponent(self, card: Card):
+        """記錄對手的牌"""
+        self._opp_mask |= card.mask
+    
+    def mark_discarded(self, card: Card):
+        """記錄棄掉的牌"""
+        self._disc_mask |= card.mask
+    
+    def _mask_to_strs(self, mask: int) -> Set[str]:
+        return {str(self._card_by_bit[bit]) for bit in _iter_bits(mask)}
+    
+    def _strs_to_mask(self, card_strs: Iterable[str]) -> int:
+        mask = 0
+        for card_str in card_strs:
+            mask |= _parse_card(card_str).mask
+        return mask
+    
+    def _available_mask(self) -> int:
+        """牌組中未被使用、對手持有或棄掉的牌"""
+        return self._deck_mask & ~(self._used_mask | self._opp_mask | self._disc_mask)
+    
     def _remove_from_deck(self, card: Card):
-        """從牌組中移除牌"""
-        try:
-            self.deck.remove(card)
-        except ValueError:
-            # 牌可能已經被移除
-            pass
+        """從牌組中移除牌（牌可能已經被移除）"""
+        self._deck_mask &= ~card.mask
     
     def _deal_cards(self, num_cards: int) -> List[Card]:
         """從剩餘牌組中發牌"""
-        available_cards = []
-        
-        for card in self.deck:
-            card_str = str(card)
-            if (card_str not in self.used_cards and 
-                card_str not in self.opponent_cards and
-                card_str not in self.discarded_cards):
-                available_cards.append(card)
+        available_cards = [self._card_by_bit[bit] for bit in _iter_bits(self._available_mask())]
         
         if len(available_cards) < num_cards:
             print(f"警告：只剩 {len(available_cards)} 張可用的牌")
@@ -356,21 +452,14 @@ class StreetByStreetCLI:
     
     def get_remaining_cards_count(self) -> int:
         """獲取剩餘可用牌數"""
-        count = 0
-        for card in self.deck:
-            card_str = str(card)
-            if (card_str not in self.used_cards and 
-                card_str not in self.opponent_cards and
-                card_str not in self.discarded_cards):
-                count += 1
-        return count
+        return _popcount(self._available_mask())
     
     def print_game_status(self):
         """打印遊戲狀態"""
         print(f"\n=== 遊戲狀態 ===")
-        print(f"已使用的牌: {len(self.used_cards)}")
-        print(f"對手的牌: {len(self.opponent_cards)}")
-        print(f"棄掉的牌: {len(self.discarded_cards)}")
+        print(f"已使用的牌: {_popcount(self._used_mask)}")
+        print(f"對手的牌: {_popcount(self._opp_mask)}")
+        print(f"棄掉的牌: {_popcount(self._disc_mask)}")
         print(f"剩餘可用牌: {self.get_remaining_cards_count()}")
         print(f"街道: {self.street_number}/4")
 
@@ -380,6 +469,8 @@ def main():
     parser.add_argument('cards', nargs='*', help='初始5張牌（可選，留空則自動發牌）')
     parser.add_argument('-s', '--simulations', type=int, default=10000,
                         help='MCTS 模擬次數')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='並行模擬的進程數（預設 1 為單進程）')
     parser.add_argument('--continue', dest='continue_game', action='store_true',
                         help='繼續遊戲（等待輸入後續街道）')
     parser.add_argument('--save-history', help='保存遊戲歷史到文件')
@@ -390,8 +481,15 @@ def main():
     args = parser.parse_args()
     
     # 創建 CLI
-    cli = StreetByStreetCLI(num_simulations=args.simulations)
-    
+    cli = StreetByStreetCLI(num_simulations=args.simulations, num_workers=args.workers)
+    try:
+        _run(cli, args)
+    finally:
+        cli.close()
+
+
+def _run(cli: StreetByStreetCLI, args: argparse.Namespace):
+    """按命令行參數跑完一局"""
     # 設置模式
     if args.manual:
         cli.auto_deal = False
@@ -400,10 +498,10 @@ def main():
     if args.opponent_cards:
         try:
             for card_str in args.opponent_cards:
-                card = Card.from_string(card_str)
-                cli.opponent_cards.add(str(card))
+                card = _parse_card(card_str)
+                cli.mark_opponent(card)
                 cli._remove_from_deck(card)
-            print(f"已記錄對手的 {len(cli.opponent_cards)} 張牌")
+            print(f"已記錄對手的 {_popcount(cli._opp_mask)} 張牌")
         except Exception as e:
             print(f"錯誤: 對手牌格式無效 - {e}")
             return
@@ -415,10 +513,10 @@ def main():
             print("錯誤: 初始必須輸入5張牌，或留空自動發牌")
             return
         try:
-            initial_cards = [Card.from_string(c) for c in args.cards]
+            initial_cards = [_parse_card(c) for c in args.cards]
             # 檢查牌是否已被使用
             for card in initial_cards:
-                if str(card) in cli.opponent_cards:
+                if card.mask & cli._opp_mask:
                     print(f"錯誤: {card} 已被對手使用！")
                     return
         except Exception as e:
@@ -472,11 +570,11 @@ def main():
                         continue
                         
                     # 解析牌
-                    street_cards = [Card.from_string(c) for c in cards_str]
+                    street_cards = [_parse_card(c) for c in cards_str]
                     
                     # 檢查是否已使用
                     for card in street_cards:
-                        if str(card) in cli.used_cards or str(card) in cli.opponent_cards:
+                        if card.mask & (cli._used_mask | cli._opp_mask):
                             print(f"錯誤: {card} 已經使用過！")
                             continue
                 
@@ -484,9 +582,9 @@ def main():
                 opp_input = input("輸入對手這輪的牌（可選，直接按 Enter 跳過）: ").strip()
                 if opp_input:
                     try:
-                        opp_cards = [Card.from_string(c) for c in opp_input.split()]
+                        opp_cards = [_parse_card(c) for c in opp_input.split()]
                         for card in opp_cards:
-                            cli.opponent_cards.add(str(card))
+                            cli.mark_opponent(card)
                             cli._remove_from_deck(card)
                         print(f"已記錄對手的牌: {' '.join(str(c) for c in opp_cards)}")
                     except Exception as e:
@@ -24,11 +24,16 @@ RANK_VALUES = {r: i for i, r in enumerate(RANKS, 2)}
 @dataclass
 class Card:
     """Represents a playing card."""
+    __slots__ = ('rank', 'suit', '_str')
     rank: str
     suit: str
     
+    def __post_init__(self):
+        # Cards are formatted constantly when printing hands; build it once
+        self._str = self.rank + self.suit
+    
     def __str__(self):
-        return f"{self.rank}{self.suit}"
+        return self._str
     
     def __lt__(self, other):
         return RANK_VALUES[self.rank] < RANK_VALUES[other.rank]
@@ -44,7 +49,14 @@ class Card:
     @classmethod
     def from_string(cls, card_str: str) -> 'Card':
         """Create a Card from string like 'As' or 'Td'."""
-        return cls(rank=card_str[0], suit=card_str[1])
+        card = _CARD_CACHE.get(card_str)
+        if card is None:
+            card = cls(rank=card_str[0], suit=card_str[1])
+        return card
+
+
+# Pre-parsed table of the 52 standard cards, shared by from_string
+_CARD_CACHE = {r + s: Card(rank=r, suit=s) for r in RANKS for s in SUITS}
 
 
 @dataclass
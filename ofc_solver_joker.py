@@ -4,13 +4,15 @@ OFC Pineapple MCTS 求解器 - 支持鬼牌版本
 支持2張鬼牌，鬼牌可以代替任何牌以形成最佳手牌組合
 """
 
+import os
 import random
 import math
-from typing import List, Dict, Tuple, Optional, Set
+from typing import List, Dict, Tuple, Optional, Set, Iterable
 from dataclasses import dataclass, field
 from collections import defaultdict
 import time
 import itertools
+import functools
 
 # Card representation
 RANKS = '23456789TJQKA'
@@ -18,6 +20,9 @@ SUITS = 'cdhs'
 RANK_VALUES = {r: i for i, r in enumerate(RANKS, 2)}
 # Add joker representation
 RANK_VALUES['X'] = 15  # Joker rank value (higher than Ace for sorting)
+# Single-bit masks for building 64-bit card sets: 4 bits per rank, jokers at bit 52
+_CARD_BITS = {r + s: 1 << (4 * i + j) for i, r in enumerate(RANKS) for j, s in enumerate(SUITS)}
+_CARD_BITS['Xj'] = 1 << 52
 
 @dataclass
 class Card:
@@ -25,8 +30,13 @@ class Card:
     rank: str
     suit: str
     
+    def __post_init__(self):
+        # Hands are printed every street; format the card once
+        self._str = self.rank + self.suit
+        self.mask = _CARD_BITS.get(self._str, 0)
+    
     def __str__(self):
-        return f"{self.rank}{self.suit}"
+        return self._str
     
     def __lt__(self, other):
         # Jokers are sorted last
@@ -55,6 +65,16 @@ class Card:
         """Create a Card from string like 'As', 'Td', or 'Xj' (joker)."""
         return cls(rank=card_str[0], suit=card_str[1])
     
+    @classmethod
+    def from_strings(cls, card_strs: Iterable[str]) -> List['Card']:
+        """Create Cards from strings like ['As', 'Kh', 'Xj'], rejecting unknown cards."""
+        cards = []
+        for card_str in card_strs:
+            if card_str not in _CARD_BITS:
+                raise ValueError(f"Invalid card: {card_str!r}")
+            cards.append(cls(card_str[0], card_str[1]))
+        return cards
+    
     @classmethod
     def joker(cls) -> 'Card':
         """Create a joker card."""
@@ -110,7 +130,7 @@ class JokerHandEvaluator:
             # Evaluate this combination
             temp_hand = Hand()
             temp_hand.cards = test_cards
-            rank, kickers = temp_hand.evaluate()
+            rank, kickers = temp_hand._evaluate_uncached()
             
             # Check if this is better
             if rank > best_rank or (rank == best_rank and kickers > best_kickers):
@@ -141,8 +161,26 @@ class Hand:
         new_hand.cards = self.cards.copy()
         return new_hand
     
+    def mask(self) -> int:
+        """Card-set bitmask of this hand (two jokers add up to bit 53)."""
+        mask = 0
+        for card in self.cards:
+            mask += card.mask
+        return mask
+    
+    def rank(self) -> int:
+        """Hand category only (0=high card .. 9), looked up by card-set mask."""
+        return rank_by_mask(self.mask(), self.cards)
+    
     def evaluate(self) -> Tuple[int, List[int]]:
         """Evaluate hand strength, handling jokers optimally."""
+        if not self.cards:
+            return (0, [])
+        rank, kickers = _evaluate_cards(tuple(self.cards))
+        return (rank, list(kickers))
+    
+    def _evaluate_uncached(self) -> Tuple[int, List[int]]:
+        """Evaluate hand strength without consulting the lookup table."""
         if not self.cards:
             return (0, [])
         
@@ -248,6 +286,42 @@ class Hand:
         return False
 
 
+@functools.lru_cache(maxsize=1 << 16)
+def _evaluate_cards(cards: Tuple[Card, ...]) -> Tuple[int, List[int]]:
+    # Lookup table of evaluated hands; the same rows are scored over and over
+    # while solving, and the joker search behind a miss is expensive
+    return Hand(cards=list(cards))._evaluate_uncached()
+
+
+# Hand categories and front-hand Fantasy Land flags keyed by card-set mask.
+# The mask identifies the set of cards regardless of order, so scoring a row
+# is a single int-keyed dict lookup instead of hashing a tuple of Cards.
+MASK_TABLE_MAX_SIZE = 1 << 18
+_RANK_BY_MASK: Dict[int, int] = {}
+_FANTASY_BY_MASK: Dict[int, bool] = {}
+
+
+def rank_by_mask(mask: int, cards: Iterable[Card]) -> int:
+    """Hand category of the card set `mask`; `cards` are only evaluated on a miss."""
+    rank = _RANK_BY_MASK.get(mask)
+    if rank is None:
+        if len(_RANK_BY_MASK) >= MASK_TABLE_MAX_SIZE:
+            _RANK_BY_MASK.clear()
+        rank = _RANK_BY_MASK[mask] = _evaluate_cards(tuple(cards))[0]
+    return rank
+
+
+def fantasy_by_mask(mask: int, cards: Iterable[Card]) -> bool:
+    """Whether the front hand `mask` qualifies for Fantasy Land; `cards` are only evaluated on a miss."""
+    qualifies = _FANTASY_BY_MASK.get(mask)
+    if qualifies is None:
+        if len(_FANTASY_BY_MASK) >= MASK_TABLE_MAX_SIZE:
+            _FANTASY_BY_MASK.clear()
+        front = Hand(cards=list(cards), max_size=3)
+        qualifies = _FANTASY_BY_MASK[mask] = front.get_fantasy_land_status()
+    return qualifies
+
+
 class PineappleStateJoker:
     """Game state for Pineapple OFC with joker support."""
     
@@ -308,9 +382,9 @@ class PineappleStateJoker:
         if not self.is_complete():
             return True  # Can't foul until complete
         
-        front_rank, _ = self.front_hand.evaluate()
-        middle_rank, _ = self.middle_hand.evaluate()
-        back_rank, _ = self.back_hand.evaluate()
+        front_rank = self.front_hand.rank()
+        middle_rank = self.middle_hand.rank()
+        back_rank = self.back_hand.rank()
         
         # Back must beat middle, middle must beat front
         return back_rank >= middle_rank >= front_rank
@@ -321,7 +395,7 @@ class PineappleStateJoker:
     
     def has_fantasy_land(self) -> bool:
         """Check if the current state qualifies for Fantasy Land."""
-        return self.front_hand.get_fantasy_land_status()
+        return fantasy_by_mask(self.front_hand.mask(), self.front_hand.cards)
 
 
 class PineappleMCTSNodeJoker:
@@ -440,8 +514,12 @@ class PineappleMCTSNodeJoker:
 class PineappleOFCSolverJoker:
     """Pineapple OFC solver with joker support."""
     
-    def __init__(self, num_simulations=10000):
+    def __init__(self, num_simulations=10000, pool=None, num_workers: int = 1):
         self.num_simulations = num_simulations
+        # Optional process pool (owned by the caller and reused across solves);
+        # when set, simulations are split into independent root-parallel trees
+        self.pool = pool
+        self.num_workers = num_workers
     
     def solve_initial_five(self, initial_cards: List[Card]) -> PineappleStateJoker:
         """Solve initial 5-card placement with full game simulation."""
@@ -453,31 +531,64 @@ class PineappleOFCSolverJoker:
         if num_jokers > 0:
             print(f"Number of jokers: {num_jokers}")
         
-        # Create full deck and remove initial cards
-        full_deck = create_full_deck(include_jokers=True)
-        remaining_deck = [c for c in full_deck if c not in initial_cards]
-        random.shuffle(remaining_deck)
-        
-        # Add initial cards to front of deck (they will be "drawn" first)
-        deck = initial_cards + remaining_deck
-        
-        # Create root node
-        root = PineappleMCTSNodeJoker(PineappleStateJoker(), remaining_deck=deck)
+        root = self._create_initial_root(initial_cards)
         
         print(f"\nRunning {self.num_simulations} simulations with full game rollouts...")
         
         # Run MCTS
-        for i in range(self.num_simulations):
-            self._run_simulation(root)
-            
-            if (i + 1) % 1000 == 0:
-                print(f"Progress: {i+1}/{self.num_simulations} simulations")
+        if self.pool is not None and self.num_workers > 1:
+            self._run_parallel_simulations(root, initial_cards)
+        else:
+            for i in range(self.num_simulations):
+                self._run_simulation(root)
+                
+                if (i + 1) % 1000 == 0:
+                    print(f"Progress: {i+1}/{self.num_simulations} simulations")
         
         # Extract best initial placement
         best_state = self._extract_best_initial_placement(root)
         
         return best_state
     
+    def _create_initial_root(self, initial_cards: List[Card]) -> PineappleMCTSNodeJoker:
+        """Create the MCTS root for an initial 5-card placement."""
+        # Create full deck and remove initial cards
+        full_deck = create_full_deck(include_jokers=True)
+        remaining_deck = [c for c in full_deck if c not in initial_cards]
+        random.shuffle(remaining_deck)
+        
+        # Add initial cards to front of deck (they will be "drawn" first)
+        deck = initial_cards + remaining_deck
+        
+        return PineappleMCTSNodeJoker(PineappleStateJoker(), remaining_deck=deck)
+    
+    def _run_parallel_simulations(self, root: PineappleMCTSNodeJoker,
+                                  initial_cards: List[Card]):
+        """Run independent trees in the pool and merge their root statistics into root."""
+        base, extra = divmod(self.num_simulations, self.num_workers)
+        batches = [base + (i < extra) for i in range(self.num_workers)]
+        # Forked workers inherit the parent's RNG state, so each tree gets its own seed
+        jobs = [(initial_cards, n, int.from_bytes(os.urandom(8), 'little'))
+                for n in batches if n]
+        results = self.pool.starmap(_initial_rollout_batch, jobs)
+        
+        merged = {}
+        for stats in results:
+            for action, visits, wins in stats:
+                key = tuple((str(card), position) for card, position in action[1])
+                if key in merged:
+                    merged[key][1] += visits
+                    merged[key][2] += wins
+                else:
+                    merged[key] = [action, visits, wins]
+        
+        for action, visits, wins in merged.values():
+            child = self._add_child(root, action)
+            child.visits = visits
+            child.wins = wins
+            root.visits += visits
+            root.wins += wins
+    
     def _run_simulation(self, node: PineappleMCTSNodeJoker) -> float:
         """Run one MCTS simulation with full game rollout."""
         # Selection
@@ -579,9 +690,9 @@ class PineappleOFCSolverJoker:
             return 0.0  # Fouled
         
         # Evaluate each hand
-        front_rank, _ = state.front_hand.evaluate()
-        middle_rank, _ = state.middle_hand.evaluate()
-        back_rank, _ = state.back_hand.evaluate()
+        front_rank = state.front_hand.rank()
+        middle_rank = state.middle_hand.rank()
+        back_rank = state.back_hand.rank()
         
         # Fantasy land bonus
         fantasy_bonus = 0.0
@@ -703,6 +814,16 @@ class PineappleOFCSolverJoker:
             return state
 
 
+def _initial_rollout_batch(initial_cards: List[Card], num_simulations: int, seed: int):
+    """Process-pool worker: grow one tree and return (action, visits, wins) per root child."""
+    random.seed(seed)
+    solver = PineappleOFCSolverJoker(num_simulations=num_simulations)
+    root = solver._create_initial_root(initial_cards)
+    for _ in range(num_simulations):
+        solver._run_simulation(root)
+    return [(child.action, child.visits, child.wins) for child in root.children]
+
+
 def main():
     """Test the Pineapple solver with jokers."""
     solver = PineappleOFCSolverJoker(num_simulations=5000)
@@ -6,7 +6,7 @@ OFC Pineapple Street-by-Street Solver
 
 import random
 import math
-from typing import List, Dict, Tuple, Optional, Set, Union, Any
+from typing import List, Dict, Tuple, Optional, Set, Union, Any, Sequence
 from dataclasses import dataclass, field
 from collections import defaultdict
 import time
@@ -52,31 +52,35 @@ class OpponentTracker:
         self.middle_cards: List[OpponentCard] = []
         self.back_cards: List[OpponentCard] = []
         self.discarded_cards: Set[Card] = set()
+        # 各墩牌數（前、中、後），隨擺牌同步更新
+        self._counts = [0, 0, 0]
         
-    def add_known_card(self, card: Card, position: str):
-        """添加已知的對手牌"""
-        self.known_cards.add(card)
-        opponent_card = OpponentCard(card=card, is_known=True, position=position)
-        
+    def _add(self, opponent_card: OpponentCard, position: str):
+        """把對手牌放入對應的墩並更新計數"""
         if position == 'front':
             self.front_cards.append(opponent_card)
+            self._counts[0] += 1
         elif position == 'middle':
             self.middle_cards.append(opponent_card)
+            self._counts[1] += 1
         elif position == 'back':
             self.back_cards.append(opponent_card)
+            self._counts[2] += 1
+    
+    def add_known_card(self, card: Card, position: str):
+        """添加已知的對手牌"""
+        self.known_cards.add(card)
+        self._add(OpponentCard(card=card, is_known=True, position=position), position)
     
     def add_unknown_cards(self, count: int, positions: List[str]):
         """添加未知的對手牌"""
         for i in range(count):
             pos = positions[i] if i < len(positions) else positions[-1]
-            opponent_card = OpponentCard(is_known=False, position=pos)
-            
-            if pos == 'front':
-                self.front_cards.append(opponent_card)
-            elif pos == 'middle':
-                self.middle_cards.append(opponent_card)
-            elif pos == 'back':
-                self.back_cards.append(opponent_card)
+            self._add(OpponentCard(is_known=False, position=pos), pos)
+    
+    def position_counts(self) -> Tuple[int, int, int]:
+        """各墩牌數 (前墩, 中墩, 後墩)，不必建立摘要字典"""
+        return tuple(self._counts)
     
     def get_used_cards(self) -> Set[Card]:
         """獲取所有已使用的牌（包括已知的對手牌）"""
@@ -84,12 +88,13 @@ class OpponentTracker:
     
     def get_opponent_state_summary(self) -> Dict[str, Any]:
         """獲取對手狀態摘要"""
+        front, middle, back = self._counts
         return {
-            'front': len(self.front_cards),
-            'middle': len(self.middle_cards),
-            'back': len(self.back_cards),
+            'front': front,
+            'middle': middle,
+            'back': back,
             'known_cards': len(self.known_cards),
-            'total_cards': len(self.front_cards) + len(self.middle_cards) + len(self.back_cards)
+            'total_cards': front + middle + back
         }
 
 
@@ -99,7 +104,7 @@ class StreetState:
     street: Street
     player_state: 'PineappleState'
     opponent_tracker: OpponentTracker
-    remaining_deck: List[Card]
+    remaining_deck: Sequence[Card]  # 唯讀：求解器只讀取剩餘牌，不得修改
     street_cards: List[Card] = field(default_factory=list)  # 本街道抽到的牌
     
     def copy(self) -> 'StreetState':
@@ -108,7 +113,7 @@ class StreetState:
             street=self.street,
             player_state=self.player_state.copy(),
             opponent_tracker=self.opponent_tracker,  # 對手追蹤器共享
-            remaining_deck=self.remaining_deck.copy(),
+            remaining_deck=list(self.remaining_deck),
             street_cards=self.street_cards.copy()
         )
         return new_state
@@ -192,6 +197,12 @@ class StreetSolver(ABC):
         pass
 
 
+# 初始街的固定擺放模式（按牌力由高到低對應的位置）
+_INITIAL_PATTERN = ('back', 'back', 'middle', 'middle', 'front')
+# 有鬼牌時，一張鬼牌放前墩，其餘按牌力對應的位置
+_JOKER_INITIAL_PATTERN = ('back', 'back', 'middle', 'middle')
+
+
 class InitialStreetSolver(StreetSolver):
     """初始5張牌求解器"""
     
@@ -228,33 +239,20 @@ class InitialStreetSolver(StreetSolver):
                               key=lambda c: RANK_VALUES[c.rank], 
                               reverse=True)
         
-        placements = []
-        
         # 策略：如果有鬼牌，優先用於前墩爭取夢幻樂園
         if jokers:
             # 放一張鬼牌在前墩
-            placements.append((jokers[0], 'front'))
+            placements = [(jokers[0], 'front')]
             
-            # 剩餘的牌
+            # 剩餘的牌：強牌放後墩，中等牌放中墩（成對擺放，最多4張）
             remaining = sorted_regular + jokers[1:]
-            
-            # 強牌放後墩
-            if len(remaining) >= 2:
-                placements.append((remaining[0], 'back'))
-                placements.append((remaining[1], 'back'))
-            
-            # 中等牌放中墩
-            if len(remaining) >= 4:
-                placements.append((remaining[2], 'middle'))
-                placements.append((remaining[3], 'middle'))
-        else:
+            count = min(len(remaining), 4) & ~1
+            placements.extend(zip(remaining[:count], _JOKER_INITIAL_PATTERN))
+        elif len(sorted_regular) >= 5:
             # 沒有鬼牌的標準擺放
-            if len(sorted_regular) >= 5:
-                placements.append((sorted_regular[0], 'back'))
-                placements.append((sorted_regular[1], 'back'))
-                placements.append((sorted_regular[2], 'middle'))
-                placements.append((sorted_regular[3], 'middle'))
-                placements.append((sorted_regular[4], 'front'))
+            placements = list(zip(sorted_regular, _INITIAL_PATTERN))
+        else:
+            placements = []
         
         return placements
 
@@ -262,8 +260,15 @@ class InitialStreetSolver(StreetSolver):
 class DrawStreetSolver(StreetSolver):
     """抽牌街道求解器（第1-4街）"""
     
-    def __init__(self, num_simulations: int = 3000):
+    TT_MAX_SIZE = 1 << 16
+    
+    def __init__(self, num_simulations: int = 3000, pool=None, num_workers: int = 1):
         self.num_simulations = num_simulations
+        # 可選的進程池（由調用方建立並在多局間重用），用於並行評估動作
+        self.pool = pool
+        self.num_workers = num_workers
+        # 置換表：相同的已擺牌面加上相同的3張牌，最佳動作也相同
+        self._tt: Dict[Tuple[int, ...], Tuple[List[Tuple[Card, str]], Card]] = {}
     
     def solve_street(self, street_state: StreetState) -> Dict[str, Any]:
         """求解抽3張擺2張棄1張"""
@@ -271,11 +276,19 @@ class DrawStreetSolver(StreetSolver):
         
         print(f"\n街道 {street_state.street.name}: 抽到 {' '.join(str(c) for c in cards)}")
         
-        # 生成所有可能的動作
-        actions = self._generate_actions(cards, street_state.player_state)
-        
-        # 評估每個動作
-        best_action = self._evaluate_actions(actions, street_state)
+        player_state = street_state.player_state
+        key = (player_state.front_hand.mask(), player_state.middle_hand.mask(),
+               player_state.back_hand.mask(), *(c.mask for c in cards))
+        best_action = self._tt.get(key)
+        if best_action is None:
+            # 生成所有可能的動作
+            actions = self._generate_actions(cards, player_state)
+            
+            # 評估每個動作
+            best_action = self._evaluate_actions(actions, street_state)
+            if len(self._tt) >= self.TT_MAX_SIZE:
+                self._tt.clear()
+            self._tt[key] = best_action
         
         # 應用最佳動作
         placements, discard = best_action
@@ -316,40 +329,81 @@ class DrawStreetSolver(StreetSolver):
     def _evaluate_actions(self, actions: List[Tuple[List[Tuple[Card, str]], Card]], 
                          street_state: StreetState) -> Tuple[List[Tuple[Card, str]], Card]:
         """評估動作並返回最佳動作"""
+        player_state = street_state.player_state
+        if self.pool is None or self.num_workers < 2 or len(actions) < 2:
+            return self._best_action(player_state, actions)[1]
+        
+        # 切成連續的區塊並按順序比較，與單進程一樣取第一個最高分的動作
+        size = -(-len(actions) // self.num_workers)
+        chunks = [actions[i:i + size] for i in range(0, len(actions), size)]
+        results = self.pool.starmap(_best_action_chunk,
+                                    [(player_state, chunk) for chunk in chunks])
+        
         best_score = -float('inf')
         best_action = None
+        for score, action in results:
+            if score > best_score:
+                best_score = score
+                best_action = action
+        return best_action
+    
+    def _best_action(self, player_state: PineappleState,
+                     actions: List[Tuple[List[Tuple[Card, str]], Card]]) -> Tuple[float, Optional[Tuple[List[Tuple[Card, str]], Card]]]:
+        """評估一組動作，返回 (最佳分數, 最佳動作)"""
+        best_score = -float('inf')
+        best_action = None
+        # 不同動作常得到相同的某一墩，同一次求解內共用各墩的評估結果
+        eval_cache: Dict[Any, Any] = {}
+        
+        # 只複製一次狀態：每個動作在同一個臨時狀態上擺牌、評估，再撤回
+        temp_state = player_state.copy()
+        hands = {
+            'front': temp_state.front_hand,
+            'middle': temp_state.middle_hand,
+            'back': temp_state.back_hand
+        }
         
         for placement, discard in actions:
-            # 創建臨時狀態
-            temp_state = street_state.player_state.copy()
-            
             # 應用動作
-            valid = True
+            placed = []
             for card, position in placement:
                 if not temp_state.place_card(card, position):
-                    valid = False
                     break
+                placed.append(position)
+            else:
+                # 評估這個狀態
+                score = self._evaluate_state(temp_state, discard, eval_cache)
+                
+                if score > best_score:
+                    best_score = score
+                    best_action = (placement, discard)
             
-            if not valid:
-                continue
-            
-            # 評估這個狀態
-            score = self._evaluate_state(temp_state, discard)
-            
-            if score > best_score:
-                best_score = score
-                best_action = (placement, discard)
-        
-        return best_action
-    
-    def _evaluate_state(self, state: PineappleState, discard: Card) -> float:
+            # 撤回本動作擺放的牌
+            for position in placed:
+                hands[position].cards.pop()
+        
+        return best_score, best_action
+    
+    @staticmethod
+    def _hand_rank(hand: Hand, cache: Dict[Any, Any]) -> int:
+        """評估單墩牌型，相同的牌只評估一次"""
+        key = hand.mask()
+        rank = cache.get(key)
+        if rank is None:
+            rank = cache[key] = hand.evaluate()[0]
+        return rank
+    
+    def _evaluate_state(self, state: PineappleState, discard: Card,
+                        cache: Optional[Dict[Any, Any]] = None) -> float:
         """評估遊戲狀態"""
+        if cache is None:
+            cache = {}
         score = 0.0
         
         # 評估各手牌強度
-        front_rank, _ = state.front_hand.evaluate()
-        middle_rank, _ = state.middle_hand.evaluate()
-        back_rank, _ = state.back_hand.evaluate()
+        front_rank = self._hand_rank(state.front_hand, cache)
+        middle_rank = self._hand_rank(state.middle_hand, cache)
+        back_rank = self._hand_rank(state.back_hand, cache)
         
         # 基礎分數
         score += front_rank * 0.2
@@ -357,7 +411,11 @@ class DrawStreetSolver(StreetSolver):
         score += back_rank * 0.5
         
         # 夢幻樂園獎勵
-        if state.has_fantasy_land():
+        fl_key = ('fantasy_land', state.front_hand.mask())
+        fantasy_land = cache.get(fl_key)
+        if fantasy_land is None:
+            fantasy_land = cache[fl_key] = state.has_fantasy_land()
+        if fantasy_land:
             score += 5.0
         
         # 棄牌懲罰（不要棄掉好牌）
@@ -374,6 +432,20 @@ class DrawStreetSolver(StreetSolver):
         return score
 
 
+def _best_action_chunk(player_state: PineappleState,
+                       actions: List[Tuple[List[Tuple[Card, str]], Card]]):
+    """進程池工作函數：評估一組動作"""
+    return DrawStreetSolver()._best_action(player_state, actions)
+
+
+def _partial_shuffle(deck: List[Card], k: int) -> None:
+    """只洗牌堆尾端k張（抽牌從尾端pop），其餘部分不動"""
+    n = len(deck)
+    for i in range(n - 1, max(n - k, 0) - 1, -1):
+        j = random.randrange(i + 1)
+        deck[i], deck[j] = deck[j], deck[i]
+
+
 class StreetByStreetSolver:
     """逐街求解器主類"""
     
@@ -395,13 +467,18 @@ class StreetByStreetSolver:
         if initial_five_cards:
             for card in initial_five_cards:
                 deck.remove(card)
-        else:
-            # 隨機抽5張
-            random.shuffle(deck)
-            initial_five_cards = [deck.pop() for _ in range(5)]
         
-        remaining_deck = deck.copy()
-        random.shuffle(remaining_deck)
+        # 一局最多用到的牌數：雙方初始5張 + 4條街各抽3張
+        cards_needed = 5 + 4 * 3 * 2
+        if not initial_five_cards:
+            cards_needed += 5
+        
+        remaining_deck = deck
+        _partial_shuffle(remaining_deck, cards_needed)
+        
+        if not initial_five_cards:
+            # 隨機抽5張
+            initial_five_cards = [remaining_deck.pop() for _ in range(5)]
         
         # 結果記錄
         results = {
@@ -497,14 +574,14 @@ class StreetByStreetSolver:
         cards_to_place = opponent_cards[:2]
         
         # 簡單策略：優先填滿後墩和中墩
-        opponent_summary = opponent_tracker.get_opponent_state_summary()
+        front, middle, back = opponent_tracker.position_counts()
         positions = []
         
-        if opponent_summary['back'] < 5:
+        if back < 5:
             positions.append('back')
-        if opponent_summary['middle'] < 5:
+        if middle < 5:
             positions.append('middle')
-        if opponent_summary['front'] < 3:
+        if front < 3:
             positions.append('front')
         
         # 擺放2張牌
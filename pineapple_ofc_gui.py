@@ -476,43 +476,21 @@ def main():
                     
                     # 複製當前狀態
                     street_solver.game_state = st.session_state.game_state
-                    street_solver.used_cards = set()
                     
                     # 添加已使用的牌
                     for card in (st.session_state.game_state.front_hand.cards + 
                                st.session_state.game_state.middle_hand.cards + 
                                st.session_state.game_state.back_hand.cards + 
                                st.session_state.game_state.discarded):
-                        street_solver.used_cards.add(str(card))
+                        street_solver.mark_used(card)
                     
                     # 生成所有可能的動作
                     actions = street_solver._generate_possible_actions(st.session_state.street_cards)
                     
-                    # 評估並找出最佳動作
-                    best_score = float('-inf')
-                    best_action = None
-                    
-                    for placements, discard in actions[:20]:  # 限制評估數量以提高速度
-                        # 創建臨時狀態
-                        temp_state = street_solver._copy_state(st.session_state.game_state)
-                        
-                        # 應用動作
-                        valid = True
-                        for card, position in placements:
-                            if not street_solver._can_place_card(temp_state, position):
-                                valid = False
-                                break
-                            street_solver._place_card_in_state(temp_state, card, position)
-                        
-                        if not valid or not temp_state.is_valid():
-                            continue
-                        
-                        # 評估狀態
-                        score = street_solver._evaluate_state(temp_state)
-                        
-                        if score > best_score:
-                            best_score = score
-                            best_action = (placements, discard)
+                    # 評估並找出最佳動作（不複製狀態，只在牌面遮罩上評分）
+                    candidates = actions[:20]  # 限制評估數量以提高速度
+                    best_index, best_score = street_solver._score_actions(candidates)
+                    best_action = candidates[best_index] if best_index is not None else None
                     
                     if best_action:
                         placements, discard = best_action
@@ -10,6 +10,12 @@ from typing import List, Optional
 
 from src.exceptions import InvalidInputError
 
+# Parsed cards keyed by their normalized (stripped, upper-cased) string.
+# Cards are immutable, so every lookup can safely share one instance. Only
+# successful parses are stored, so the table is bounded by the number of
+# valid spellings (13 ranks x 8 suit characters, plus the joker).
+_FROM_STRING_CACHE: dict = {}
+
 
 class Rank(IntEnum):
     """Card ranks with optimized integer values."""
@@ -210,6 +216,10 @@ class Card:
         
         Examples: "As", "2h", "Tc", "JOKER"
         
+        Results are cached per normalized string, so repeated parses of
+        the same card (regardless of case or surrounding whitespace)
+        return the same immutable instance.
+        
         Args:
             card_str: String representation of card
             
@@ -219,6 +229,18 @@ class Card:
         Raises:
             InvalidInputError: If string format is invalid
         """
+        if cls is Card and isinstance(card_str, str):
+            key = card_str.strip().upper()
+            card = _FROM_STRING_CACHE.get(key)
+            if card is None:
+                # Parse the raw input so errors report what the caller passed
+                card = _FROM_STRING_CACHE[key] = cls._parse_string(card_str)
+            return card
+        return cls._parse_string(card_str)
+    
+    @classmethod
+    def _parse_string(cls, card_str: str) -> "Card":
+        """Parse and validate a card string without consulting the cache."""
         if not isinstance(card_str, str):
             raise InvalidInputError(
                 "Card string must be a string",
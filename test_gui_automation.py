@@ -23,18 +23,12 @@ class TestPineappleGUI(unittest.TestCase):
     def setUpClass(cls):
         """測試類設置"""
         TestConfig.ensure_directories()
-        cls.driver = WebDriverManager.create_driver()
+        cls.driver = WebDriverManager.get_or_create_driver()
         cls.base_url = TestConfig.BASE_URL
     
-    @classmethod
-    def tearDownClass(cls):
-        """測試類清理"""
-        if hasattr(cls, 'driver'):
-            cls.driver.quit()
-    
     def setUp(self):
         """每個測試方法前的設置"""
-        self.driver.get(self.base_url)
+        WebDriverManager.reset_driver(self.driver, self.base_url)
         self.streamlit = StreamlitHelper(self.driver)
         self.game = GameHelper(self.driver)
         self.recorder = TestRecorder(self._testMethodName)
@@ -53,6 +47,7 @@ class TestPineappleGUI(unittest.TestCase):
                 self.recorder.take_screenshot(self.driver, "failure")
         
         self.recorder.save_report()
+        self.recorder.flush()
     
     def test_new_game_initialization(self):
         """測試新遊戲初始化"""
@@ -250,18 +245,12 @@ class TestGameScenarios(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """測試類設置"""
-        cls.driver = WebDriverManager.create_driver()
+        cls.driver = WebDriverManager.get_or_create_driver()
         cls.base_url = TestConfig.BASE_URL
     
-    @classmethod
-    def tearDownClass(cls):
-        """測試類清理"""
-        if hasattr(cls, 'driver'):
-            cls.driver.quit()
-    
     def setUp(self):
         """測試設置"""
-        self.driver.get(self.base_url)
+        WebDriverManager.reset_driver(self.driver, self.base_url)
         self.streamlit = StreamlitHelper(self.driver)
         self.game = GameHelper(self.driver)
         self.recorder = TestRecorder(self._testMethodName)
@@ -333,18 +322,12 @@ class TestPerformance(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """測試類設置"""
-        cls.driver = WebDriverManager.create_driver()
+        cls.driver = WebDriverManager.get_or_create_driver()
         cls.base_url = TestConfig.BASE_URL
     
-    @classmethod
-    def tearDownClass(cls):
-        """測試類清理"""
-        if hasattr(cls, 'driver'):
-            cls.driver.quit()
-    
     def setUp(self):
         """測試設置"""
-        self.driver.get(self.base_url)
+        WebDriverManager.reset_driver(self.driver, self.base_url)
         self.streamlit = StreamlitHelper(self.driver)
         self.game = GameHelper(self.driver)
         self.performance = PerformanceMonitor(self.driver)
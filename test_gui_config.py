@@ -28,18 +28,27 @@ class TestConfig:
     PAGE_LOAD_TIMEOUT = 30
     IMPLICIT_WAIT = 5
     ELEMENT_WAIT = 10
+    RERUN_START_WAIT = 0.3  # 點擊後等待 Streamlit 開始重新執行的時間（沒有 post_condition 時）
     AI_COMPUTATION_TIMEOUT = 60  # AI 計算可能需要較長時間
     
-    # 截圖設置
+    # 並行測試（pytest-xdist）的 worker 編號，如 "gw0"；非並行時為 None
+    WORKER_ID = os.getenv("PYTEST_XDIST_WORKER")
+    
+    # Selenium Grid 地址（可選，設置後使用遠端瀏覽器）
+    GRID_URL = os.getenv("SELENIUM_GRID_URL", None)
+    
+    # 截圖設置（並行時每個 worker 使用獨立的子目錄）
     SCREENSHOT_ON_FAILURE = True
-    SCREENSHOT_DIR = os.path.join(os.path.dirname(__file__), "test_screenshots")
+    SCREENSHOT_DIR = os.path.join(os.path.dirname(__file__), "test_screenshots", WORKER_ID or "")
     
     # 測試數據
-    TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "test_data")
+    TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "test_data", WORKER_ID or "")
     
     # WebDriver 路徑（可選，如果不在 PATH 中）
     CHROME_DRIVER_PATH = os.getenv("CHROME_DRIVER_PATH", None)
     FIREFOX_DRIVER_PATH = os.getenv("FIREFOX_DRIVER_PATH", None)
+    # 已知本機有驅動時設為 1，跳過 webdriver-manager 的聯網版本檢查（CI 快速路徑）
+    SKIP_DRIVER_CHECK = os.getenv("OFC_SKIP_DRIVER_CHECK") == "1"
     
     # 瀏覽器選項
     BROWSER_OPTIONS = {
@@ -83,6 +92,7 @@ class TestConfig:
         "download_button": '[data-testid="stDownloadButton"]',
         "metric": '[data-testid="metric-container"]',
         "spinner": '[data-testid="stSpinner"]',
+        "running": '[data-testid="stStatusWidget"]',
         "success_message": '[data-testid="stAlert"][data-baseweb="notification"][kind="success"]',
         "error_message": '[data-testid="stAlert"][data-baseweb="notification"][kind="error"]',
         "info_message": '[data-testid="stAlert"][data-baseweb="notification"][kind="info"]',
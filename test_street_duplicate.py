@@ -59,27 +59,9 @@ def test_street_suggestion():
             print("  ✗ 發現重複牌！")
             
     # 找出最佳動作
-    best_score = float('-inf')
-    best_action = None
-    
-    for placements, discard in actions[:20]:
-        temp_state = solver._copy_state(game_state)
-        
-        valid = True
-        for card, position in placements:
-            if not solver._can_place_card(temp_state, position):
-                valid = False
-                break
-            solver._place_card_in_state(temp_state, card, position)
-        
-        if not valid or not temp_state.is_valid():
-            continue
-        
-        score = solver._evaluate_state(temp_state)
-        
-        if score > best_score:
-            best_score = score
-            best_action = (placements, discard)
+    candidates = actions[:20]
+    best_index, best_score = solver._score_actions(candidates)
+    best_action = candidates[best_index] if best_index is not None else None
     
     if best_action:
         placements, discard = best_action
@@ -21,7 +21,7 @@ def test_auto_deal():
     opponent_cards = ["As", "Kh", "Qd", "Jc", "10s"]
     for card_str in opponent_cards:
         card = Card.from_string(card_str)
-        cli.opponent_cards.add(str(card))
+        cli.mark_opponent(card)
         cli._remove_from_deck(card)
     
     print(f"對手的牌: {', '.join(opponent_cards)}")
@@ -77,17 +77,17 @@ def test_card_tracking():
     opp_cards = ["As", "Ks", "Qs"]
     for card_str in opp_cards:
         card = Card.from_string(card_str)
-        cli.opponent_cards.add(str(card))
+        cli.mark_opponent(card)
         cli._remove_from_deck(card)
     
     # 發一些牌
     dealt = cli._deal_cards(5)
     for card in dealt:
-        cli.used_cards.add(str(card))
+        cli.mark_used(card)
     
     # 棄牌
     discard = Card.from_string("2h")
-    cli.discarded_cards.add(str(discard))
+    cli.mark_discarded(discard)
     cli._remove_from_deck(discard)
     
     # 打印狀態
@@ -105,6 +105,21 @@ def test_card_tracking():
     
     print("\n✅ 牌追蹤系統測試通過！")
 
+def test_joker_tracking():
+    """測試鬼牌也能被追蹤"""
+    print("\n=== 測試鬼牌追蹤 ===")
+    
+    cli = StreetByStreetCLI(num_simulations=100)
+    joker = Card.from_string("Xj")
+    cli.mark_opponent(joker)
+    cli.mark_used(joker)
+    
+    assert cli.opponent_cards == {"Xj"}, "對手的鬼牌應該被記錄"
+    assert cli.used_cards == {"Xj"}, "已使用的鬼牌應該被記錄"
+    assert cli.get_remaining_cards_count() == 52, "鬼牌不在牌組中，不影響剩餘牌數"
+    
+    print("\n✅ 鬼牌追蹤測試通過！")
+
 def test_manual_vs_auto_mode():
     """測試手動和自動模式切換"""
     print("\n=== 測試模式切換 ===")
@@ -128,6 +143,7 @@ def main():
     try:
         test_auto_deal()
         test_card_tracking()
+        test_joker_tracking()
         test_manual_vs_auto_mode()
         
         print("\n" + "="*50)
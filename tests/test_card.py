@@ -3,7 +3,7 @@ Comprehensive test suite for Card domain model.
 """
 
 import pytest
-from src.core.domain.card import Card, Rank, Suit
+from src.core.domain.card import Card, Rank, Suit, _FROM_STRING_CACHE
 from src.exceptions import InvalidInputError
 
 
@@ -201,6 +201,23 @@ class TestCard:
         joker = Card.from_string("joker")  # Case insensitive
         assert joker.is_joker
     
+    def test_from_string_cached(self):
+        """Test repeated parses of the same string share one instance."""
+        assert Card.from_string("Qh") is Card.from_string("Qh")
+        assert Card.from_string("Qh") == Card.from_string("qH")
+        
+        # Case and whitespace variants share one cache entry
+        jack = Card.from_string("Jd")
+        size = len(_FROM_STRING_CACHE)
+        for variant in [" Jd", "Jd ", "  Jd", "jd", "JD"]:
+            assert Card.from_string(variant) is jack
+        assert len(_FROM_STRING_CACHE) == size
+        
+        # Invalid strings are never cached
+        for _ in range(2):
+            with pytest.raises(InvalidInputError):
+                Card.from_string("Zz")
+    
     def test_from_string_invalid(self):
         """Test creating card from invalid string."""
         with pytest.raises(InvalidInputError) as exc_info: